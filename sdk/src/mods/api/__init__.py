@@ -1,13 +1,30 @@
+from . import aio
+from .call_store import CallStore
+from .catalog import Catalog, get_catalog
 from .query import (
     get_calls,
+    get_calls_column,
     get_objs,
     get_op_versions,
     get_ops,
+    resolve_refs,
 )
+from .ref_store import enable_ref_store
+from .trace import Trace, get_trace, get_traces
 
 __all__ = [
     "get_calls",
+    "get_calls_column",
     "get_objs",
     "get_ops",
     "get_op_versions",
+    "resolve_refs",
+    "aio",
+    "CallStore",
+    "Catalog",
+    "get_catalog",
+    "enable_ref_store",
+    "Trace",
+    "get_trace",
+    "get_traces",
 ]
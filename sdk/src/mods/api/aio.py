@@ -0,0 +1,70 @@
+"""asyncio versions of the mods.api query helpers.
+
+The trace server client is blocking, so these run the requests on a worker
+thread and leave the event loop free for other work, e.g. embedding or LLM
+requests made while calls are being fetched.
+"""
+
+import asyncio
+from typing import Callable, List, Optional
+
+import pandas as pd
+from weave.trace.weave_client import WeaveClient
+from weave.trace_server.trace_server_interface import CallsFilter
+
+from mods.api import query
+from mods.api.query import Calls, Obj, Op
+from mods.api.weave_api_next import Pagination
+
+
+async def get_calls(
+    _client: WeaveClient,
+    op_name: str | List[str] | List[Op] | None,
+    input_refs: list[str] | str | None = None,
+    calls_filter: CallsFilter | None = None,
+    trace_roots_only: bool | None = None,
+    limit: int | None = None,
+    callback: Optional[Callable[[int], None]] = None,
+    prefetch: int | None = None,
+    pagination: Pagination | None = None,
+    stream: bool | None = None,
+    columns: List[str] | None = None,
+    expand_columns: List[str] | None = None,
+    shards: int = 1,
+    sample: int | None = None,
+    stratify_by: str | None = None,
+    seed: int | None = None,
+    max_memory: int | None = None,
+    usage_by_model: bool = False,
+    categorical: bool = False,
+) -> Calls:
+    return await asyncio.to_thread(
+        query.get_calls,
+        _client,
+        op_name,
+        input_refs=input_refs,
+        calls_filter=calls_filter,
+        trace_roots_only=trace_roots_only,
+        limit=limit,
+        callback=callback,
+        prefetch=prefetch,
+        pagination=pagination,
+        stream=stream,
+        columns=columns,
+        expand_columns=expand_columns,
+        shards=shards,
+        sample=sample,
+        stratify_by=stratify_by,
+        seed=seed,
+        max_memory=max_memory,
+        usage_by_model=usage_by_model,
+        categorical=categorical,
+    )
+
+
+async def get_objs(client: WeaveClient, types=None, latest_only=True) -> List[Obj]:
+    return await asyncio.to_thread(query.get_objs, client, types, latest_only)
+
+
+async def resolve_refs(_client: WeaveClient, refs: List[str]) -> pd.DataFrame:
+    return await asyncio.to_thread(query.resolve_refs, _client, refs)
@@ -0,0 +1,247 @@
+import json
+from typing import Any, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+# String columns with fewer distinct values than this fraction of their rows
+# are dictionary encoded in Arrow tables.
+DICTIONARY_MAX_RATIO = 0.5
+
+# Field metadata marking string columns that hold JSON encoded values
+JSON_METADATA = {b"mods.encoding": b"json"}
+
+# Field metadata marking dictionary encoded columns to read back as categoricals
+CATEGORICAL_METADATA = {b"mods.encoding": b"categorical"}
+
+_ARROW_ERRORS = (pa.ArrowException, TypeError, ValueError, OverflowError)
+
+
+def _flatten_into(out: dict, d: dict, prefix: str) -> None:
+    for k, v in d.items():
+        key = f"{prefix}.{k}"
+        if isinstance(v, dict):
+            _flatten_into(out, v, key)
+        else:
+            out[key] = v
+
+
+def flatten_record(record: dict) -> dict:
+    # Same column naming and ordering as pd.json_normalize: top level scalars
+    # keep their position, nested dicts are expanded after them in order.
+    flat = {}
+    nested = []
+    for k, v in record.items():
+        if not isinstance(k, str):
+            k = str(k)
+        if isinstance(v, dict):
+            nested.append((k, v))
+        else:
+            flat[k] = v
+    for k, v in nested:
+        _flatten_into(flat, v, k)
+    return flat
+
+
+def _is_nested(type: pa.DataType) -> bool:
+    return pa.types.is_nested(type) or pa.types.is_dictionary(type)
+
+
+def to_arrow_array(values: list) -> Optional[pa.Array]:
+    """Convert a column of python values to a typed Arrow array.
+
+    Returns None when the values have no single Arrow type (mixed types, weave
+    objects) or are lists and dicts, which are kept as python objects.
+    """
+    try:
+        arr = pa.array(values, from_pandas=True)
+    except _ARROW_ERRORS:
+        return None
+    if _is_nested(arr.type):
+        return None
+    return arr
+
+
+def _to_json_array(values: list) -> pa.Array:
+    return pa.array(
+        [None if v is None else json.dumps(v, default=str) for v in values],
+        type=pa.string(),
+    )
+
+
+def to_arrow_column(values: list) -> pa.Array:
+    """Like to_arrow_array, but values without a scalar type become JSON strings."""
+    arr = to_arrow_array(values)
+    return _to_json_array(values) if arr is None else arr
+
+
+def _to_field_array(name: str, values: list) -> tuple[pa.Field, pa.Array]:
+    arr = to_arrow_array(values)
+    if arr is not None:
+        return pa.field(name, arr.type), arr
+    arr = _to_json_array(values)
+    return pa.field(name, arr.type, metadata=JSON_METADATA), arr
+
+
+def _dictionary_encode(field: pa.Field, arr: pa.Array) -> tuple[pa.Field, pa.Array]:
+    # Low cardinality strings are stored once, with integer codes per row
+    if pa.types.is_string(arr.type) and not _is_json(field) and len(arr) > 0:
+        if len(arr.unique()) <= DICTIONARY_MAX_RATIO * len(arr):
+            arr = arr.dictionary_encode()
+            field = field.with_type(arr.type)
+    return field, arr
+
+
+def _encoding(field: pa.Field) -> Optional[bytes]:
+    return field.metadata.get(b"mods.encoding") if field.metadata else None
+
+
+def _is_json(field: pa.Field) -> bool:
+    return _encoding(field) == b"json"
+
+
+def frame_to_table(df: pd.DataFrame, categorical: bool = False) -> pa.Table:
+    """Convert a frame to Arrow, storing non-scalar columns as JSON strings.
+
+    JSON columns are marked in the field metadata so table_to_frame can decode
+    them back to python values. With categorical, low cardinality string
+    columns are dictionary encoded and read back as categoricals.
+    """
+    fields, arrays = [], []
+    for name in df.columns:
+        values = [None if v is pd.NaT else v for v in df[name].tolist()]
+        field, arr = _to_field_array(str(name), values)
+        if categorical:
+            field, arr = _dictionary_encode(field, arr)
+            if pa.types.is_dictionary(arr.type):
+                field = field.with_metadata(CATEGORICAL_METADATA)
+        fields.append(field)
+        arrays.append(arr)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """Convert a table written by frame_to_table (or to_table) back to a frame.
+
+    Dictionary encoded columns are decoded, except those frame_to_table marked
+    as categorical.
+    """
+    data = {}
+    for field, col in zip(table.schema, table.columns):
+        if pa.types.is_dictionary(field.type) and _encoding(field) != b"categorical":
+            col = col.cast(field.type.value_type)
+        if _is_json(field):
+            data[field.name] = pd.Series(
+                [None if v is None else json.loads(v) for v in col.to_pylist()],
+                dtype=object,
+            )
+        elif pa.types.is_null(field.type):
+            data[field.name] = pd.Series([None] * len(col), dtype=object)
+        else:
+            data[field.name] = col.to_pandas(coerce_temporal_nanoseconds=True)
+    return pd.DataFrame(data, index=pd.RangeIndex(table.num_rows))
+
+
+def _field_kind(field: pa.Field) -> tuple[str, bool]:
+    type = field.type
+    if pa.types.is_dictionary(type):
+        type = type.value_type
+    numeric = pa.types.is_integer(type) or pa.types.is_floating(type)
+    return ("number" if numeric else str(type)), _is_json(field)
+
+
+def concat_tables(tables: list[pa.Table]) -> pa.Table:
+    """Concatenate tables whose columns may differ in presence and type.
+
+    Missing columns are filled with nulls and numbers are promoted; columns
+    holding different kinds of values are re-encoded as JSON everywhere.
+    """
+    kinds: dict[str, set[tuple[str, bool]]] = {}
+    types: dict[str, set[pa.DataType]] = {}
+    for table in tables:
+        for field in table.schema:
+            if not pa.types.is_null(field.type):
+                kinds.setdefault(field.name, set()).add(_field_kind(field))
+                types.setdefault(field.name, set()).add(field.type)
+    conflicting = {name for name, k in kinds.items() if len(k) > 1}
+    # Columns dictionary encoded in some tables but not others are decoded
+    decoded = {
+        name
+        for name, t in types.items()
+        if len(t) > 1 and any(pa.types.is_dictionary(x) for x in t)
+    }
+    unified = []
+    for table in tables:
+        for name in (decoded - conflicting) & set(table.column_names):
+            i = table.schema.get_field_index(name)
+            field = table.schema.field(i)
+            if pa.types.is_dictionary(field.type):
+                value_type = field.type.value_type
+                table = table.set_column(
+                    i, pa.field(name, value_type), table.column(i).cast(value_type)
+                )
+        for name in conflicting & set(table.column_names):
+            i = table.schema.get_field_index(name)
+            field = table.schema.field(i)
+            if _is_json(field):
+                continue
+            values = table.column(i).to_pylist()
+            table = table.set_column(
+                i,
+                pa.field(name, pa.string(), metadata=JSON_METADATA),
+                _to_json_array(values),
+            )
+        unified.append(table)
+    return pa.concat_tables(unified, promote_options="permissive")
+
+
+class ColumnarBuilder:
+    """Accumulate records straight into per-column buffers.
+
+    Records are flattened as they are appended, so no list of dicts is held
+    for the whole result. Scalar columns become typed Arrow arrays (timestamps,
+    numbers, strings), everything else stays as python objects.
+    """
+
+    def __init__(self) -> None:
+        self._columns: dict[str, list[Any]] = {}
+        self._num_rows = 0
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    def append(self, record: dict) -> None:
+        row = self._num_rows
+        for k, v in flatten_record(record).items():
+            col = self._columns.get(k)
+            if col is None:
+                col = self._columns[k] = []
+            if len(col) < row:
+                col.extend([None] * (row - len(col)))
+            col.append(v)
+        self._num_rows += 1
+
+    def _padded_columns(self) -> dict[str, list[Any]]:
+        for col in self._columns.values():
+            if len(col) < self._num_rows:
+                col.extend([None] * (self._num_rows - len(col)))
+        return self._columns
+
+    def to_df(self) -> pd.DataFrame:
+        data = {}
+        for name, values in self._padded_columns().items():
+            arr = to_arrow_array(values)
+            if arr is None or pa.types.is_null(arr.type):
+                data[name] = pd.Series(values, dtype=object)
+            else:
+                data[name] = arr.to_pandas(coerce_temporal_nanoseconds=True)
+        return pd.DataFrame(data, index=pd.RangeIndex(self._num_rows))
+
+    def to_table(self) -> pa.Table:
+        """Build an Arrow table, with nested values stored as JSON strings."""
+        fields, arrays = [], []
+        for name, values in self._padded_columns().items():
+            field, arr = _dictionary_encode(*_to_field_array(name, values))
+            fields.append(field)
+            arrays.append(arr)
+        return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
@@ -0,0 +1,240 @@
+"""An on-disk store of calls that is refreshed incrementally.
+
+Each (project, filter, columns) combination keeps the calls fetched so far and
+a keyset cursor: the latest started_at seen plus the ids seen at exactly that
+time. A refresh asks the server for calls started after the cursor minus an
+overlap window, upserting them by id, so calls that arrive late with an older
+started_at are still picked up. It also re-reads the calls that were still
+running (no ended_at) on the last refresh, however old they are.
+
+Calls deleted on the server after they were stored are not removed.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sys
+import zlib
+from contextlib import closing
+from typing import Callable, Iterable, List, Optional
+
+from weave.trace.weave_client import WeaveClient
+from weave.trace_server.trace_server_interface import CallSchema, CallsFilter
+
+from mods.api.query import (
+    Calls,
+    Op,
+    calls_to_frame,
+    op_name_uris,
+    server_columns_for,
+)
+from mods.api.sqlite_util import CACHE_DIR, connect
+from mods.api.weave_api_next import (
+    CallsIter,
+    KeysetCursor,
+    advance_keyset_cursor,
+    as_utc,
+    make_lazy_client_call,
+    weave_client_calls_filter,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    key TEXT NOT NULL,
+    id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    running INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (key, id)
+);
+CREATE INDEX IF NOT EXISTS calls_running ON calls (key, running);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    seen_ids TEXT NOT NULL
+);
+"""
+
+# Calls written per transaction, and ids per request when refreshing running calls
+BATCH_SIZE = 1000
+# How far before the cursor a refresh starts reading again. Calls are logged
+# with their client side start time and can reach the server after calls that
+# started later.
+SYNC_OVERLAP = datetime.timedelta(minutes=5)
+
+
+class CallStore:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        overlap: datetime.timedelta = SYNC_OVERLAP,
+    ) -> None:
+        self.path = path or os.path.join(CACHE_DIR, "calls.sqlite")
+        self.overlap = overlap
+        with closing(connect(self.path)) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def _key(
+        self,
+        project_id: str,
+        filter: CallsFilter,
+        columns: List[str] | None,
+        expand_columns: List[str] | None,
+    ) -> str:
+        spec = {
+            "project_id": project_id,
+            "filter": filter.model_dump(mode="json"),
+            "columns": columns,
+            "expand_columns": expand_columns,
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+    def _upsert(self, conn, key: str, calls: Iterable[CallSchema]) -> int:
+        rows = [
+            (
+                key,
+                call.id,
+                as_utc(call.started_at).timestamp(),
+                int(call.ended_at is None),
+                zlib.compress(call.model_dump_json().encode()),
+            )
+            for call in calls
+        ]
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO calls VALUES (?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def _load_cursor(self, conn, key: str) -> Optional[KeysetCursor]:
+        row = conn.execute(
+            "SELECT started_at, seen_ids FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return as_utc(datetime.datetime.fromisoformat(row[0])), set(json.loads(row[1]))
+
+    def _save_cursor(self, conn, key: str, cursor: KeysetCursor) -> None:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (key, cursor[0].isoformat(), json.dumps(sorted(cursor[1]))),
+            )
+
+    def sync(
+        self,
+        _client: WeaveClient,
+        filter: CallsFilter,
+        columns: List[str] | None = None,
+        expand_columns: List[str] | None = None,
+        callback: Optional[Callable[[int], None]] = None,
+    ) -> str:
+        """Fetch calls newer than the cursor's overlap window, and running calls.
+
+        Returns the store key the calls were written under.
+        """
+        project_id = _client._project_id()
+        key = self._key(project_id, filter, columns, expand_columns)
+        with closing(connect(self.path)) as conn:
+            cursor = self._load_cursor(conn, key)
+            running_ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT id FROM calls WHERE key = ? AND running = 1", (key,)
+                )
+            ]
+
+            # Re-read calls that hadn't finished yet, dropping any that are gone
+            for i in range(0, len(running_ids), BATCH_SIZE):
+                chunk = running_ids[i : i + BATCH_SIZE]
+                refreshed = list(
+                    CallsIter(
+                        _client.server,
+                        project_id,
+                        filter.model_copy(update={"call_ids": chunk}),
+                        columns=columns,
+                        limit=len(chunk),
+                        expand_columns=expand_columns,
+                    ).server_calls()
+                )
+                self._upsert(conn, key, refreshed)
+                gone = set(chunk) - {c.id for c in refreshed}
+                if gone:
+                    with conn:
+                        conn.executemany(
+                            "DELETE FROM calls WHERE key = ? AND id = ?",
+                            [(key, call_id) for call_id in gone],
+                        )
+
+            # Re-read the overlap window before the cursor, rows already
+            # stored are replaced by id.
+            after = None if cursor is None else (cursor[0] - self.overlap, set())
+            new_calls = CallsIter(
+                _client.server,
+                project_id,
+                filter,
+                columns=columns,
+                limit=sys.maxsize,
+                callback=callback,
+                pagination="keyset",
+                expand_columns=expand_columns,
+                after=after,
+            ).server_calls()
+            batch: list[CallSchema] = []
+            for call in new_calls:
+                batch.append(call)
+                if len(batch) >= BATCH_SIZE:
+                    self._upsert(conn, key, batch)
+                    cursor = advance_keyset_cursor(cursor, batch)
+                    batch = []
+            if batch:
+                self._upsert(conn, key, batch)
+                cursor = advance_keyset_cursor(cursor, batch)
+            if cursor is not None:
+                self._save_cursor(conn, key, cursor)
+        return key
+
+    def load(self, key: str) -> Iterable[CallSchema]:
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute(
+                "SELECT payload FROM calls WHERE key = ? ORDER BY started_at, id",
+                (key,),
+            )
+            for (payload,) in rows:
+                yield CallSchema.model_validate_json(zlib.decompress(payload))
+
+    def get_calls(
+        self,
+        _client: WeaveClient,
+        op_name: str | List[str] | List[Op] | None,
+        input_refs: list[str] | str | None = None,
+        calls_filter: CallsFilter | None = None,
+        trace_roots_only: bool | None = None,
+        callback: Optional[Callable[[int], None]] = None,
+        columns: List[str] | None = None,
+        expand_columns: List[str] | None = None,
+    ) -> Calls:
+        """Like mods.api.get_calls, but only fetches calls not already stored."""
+        if calls_filter is None:
+            calls_filter = weave_client_calls_filter(
+                _client, op_name_uris(op_name), input_refs, trace_roots_only
+            )
+        _, server_columns = server_columns_for(columns)
+        key = self.sync(_client, calls_filter, server_columns, expand_columns, callback)
+        entity, project = _client._project_id().split("/")
+        calls = (
+            make_lazy_client_call(entity, project, call, _client.server)
+            for call in self.load(key)
+        )
+        return calls_to_frame(calls, _client._project_id(), columns)
+
+
+_default_store: Optional[CallStore] = None
+
+
+def default_call_store() -> CallStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = CallStore()
+    return _default_store
@@ -0,0 +1,185 @@
+"""An in-memory index of a project's op and object versions.
+
+Widgets like selectboxes ask for the same op and object lists on every
+rerun. A Catalog holds every version once, indexed by name, base class and
+latest version, and refreshes by polling for versions created since the last
+one it saw.
+
+Versions deleted on the server after they were indexed are not removed.
+"""
+
+import bisect
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional
+
+from weave.trace.weave_client import WeaveClient
+from weave.trace_server.trace_server_interface import ObjQueryReq, ObjSchema, SortBy
+
+from mods.api.query import Obj, Op, add_call_counts
+
+# Versions requested per page while polling for new ones
+PAGE_SIZE = 500
+# Minimum seconds between refreshes, reads in between are served from memory
+REFRESH_INTERVAL = 30.0
+
+OP = "op"
+OBJECT = "object"
+
+
+class Catalog:
+    def __init__(
+        self, client: WeaveClient, refresh_interval: float = REFRESH_INTERVAL
+    ) -> None:
+        self.client = client
+        self.refresh_interval = refresh_interval
+        # (kind, name) -> digest -> version
+        self._versions: Dict[tuple[str, str], Dict[str, ObjSchema]] = {}
+        self._latest: Dict[tuple[str, str], ObjSchema] = {}
+        # base_object_class -> object names
+        self._by_class: Dict[str, set[str]] = {}
+        # kind -> sorted names, for prefix search
+        self._names: Dict[str, List[str]] = {OP: [], OBJECT: []}
+        self._high_water: Optional[datetime.datetime] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def _add(self, obj: ObjSchema) -> bool:
+        kind = OP if obj.kind == "op" else OBJECT
+        key = (kind, obj.object_id)
+        versions = self._versions.get(key)
+        if versions is None:
+            versions = self._versions[key] = {}
+            bisect.insort(self._names[kind], obj.object_id)
+        if obj.digest in versions:
+            return False
+        versions[obj.digest] = obj
+        latest = self._latest.get(key)
+        if latest is None or obj.version_index > latest.version_index:
+            self._latest[key] = obj
+        if kind == OBJECT and obj.base_object_class:
+            self._by_class.setdefault(obj.base_object_class, set()).add(obj.object_id)
+        if self._high_water is None or obj.created_at > self._high_water:
+            self._high_water = obj.created_at
+        return True
+
+    def refresh(self, force: bool = False) -> int:
+        """Index versions created since the last refresh, returns how many."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._refreshed_at is not None
+                and now - self._refreshed_at < self.refresh_interval
+            ):
+                return 0
+            high_water = self._high_water
+            added = 0
+            offset = 0
+            while True:
+                # Newest first, so we can stop at the first page reaching
+                # versions we've already seen.
+                response = self.client.server.objs_query(
+                    ObjQueryReq(
+                        project_id=self.client._project_id(),
+                        sort_by=[SortBy(field="created_at", direction="desc")],
+                        limit=PAGE_SIZE,
+                        offset=offset,
+                        metadata_only=True,
+                    )
+                )
+                for obj in response.objs:
+                    added += self._add(obj)
+                if len(response.objs) < PAGE_SIZE:
+                    break
+                if high_water is not None and any(
+                    obj.created_at < high_water for obj in response.objs
+                ):
+                    break
+                offset += PAGE_SIZE
+            self._refreshed_at = now
+            return added
+
+    def versions(self, name: str, kind: str = OP) -> List[ObjSchema]:
+        """All versions of an op or object, newest first."""
+        self.refresh()
+        with self._lock:
+            versions = list(self._versions.get((kind, name), {}).values())
+        return sorted(versions, key=lambda v: v.version_index, reverse=True)
+
+    def latest(self, kind: str, names: Optional[List[str]] = None) -> List[ObjSchema]:
+        self.refresh()
+        with self._lock:
+            if names is None:
+                names = self._names[kind]
+            return [self._latest[(kind, name)] for name in names]
+
+    def search(self, prefix: str, kind: str = OBJECT) -> List[str]:
+        """Names of ops or objects starting with prefix, in sorted order."""
+        self.refresh()
+        with self._lock:
+            names = self._names[kind]
+            start = bisect.bisect_left(names, prefix)
+            end = bisect.bisect_left(names, prefix + "\U0010ffff")
+            return names[start:end]
+
+    def get_ops(self, latest_only: bool = True) -> List[Op]:
+        if latest_only:
+            ops = self.latest(OP)
+        else:
+            ops = [v for name in self.search("", OP) for v in self.versions(name)]
+        return [Op(o.project_id, o.object_id, o.digest, o.version_index) for o in ops]
+
+    def get_op_versions(self, op: Op, include_call_counts: bool = False) -> List[Op]:
+        ops = [
+            Op(o.project_id, o.object_id, o.digest, o.version_index)
+            for o in self.versions(op.name, OP)
+        ]
+        if include_call_counts:
+            add_call_counts(self.client, ops)
+        return ops
+
+    def get_objs(self, types=None, latest_only: bool = True) -> List[Obj]:
+        if isinstance(types, str):
+            types = [types]
+        # Refresh first, so classes published since the last refresh resolve
+        self.refresh()
+        with self._lock:
+            if types:
+                names = sorted(
+                    {name for t in types for name in self._by_class.get(t, ())}
+                )
+            else:
+                names = None
+        if latest_only:
+            objs = self.latest(OBJECT, names)
+        else:
+            if names is None:
+                names = self.search("", OBJECT)
+            objs = [v for name in names for v in self.versions(name, OBJECT)]
+        if types:
+            # An object's base class can change between versions
+            objs = [o for o in objs if o.base_object_class in types]
+        return sorted(
+            [
+                Obj(o.project_id, o.object_id, o.digest, o.version_index, o.created_at)
+                for o in objs
+            ],
+            key=lambda o: o.created_at,
+            reverse=True,
+        )
+
+
+_catalogs: Dict[str, Catalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(client: WeaveClient) -> Catalog:
+    """The shared Catalog for the client's project."""
+    project_id = client._project_id()
+    with _catalogs_lock:
+        catalog = _catalogs.get(project_id)
+        if catalog is None:
+            catalog = _catalogs[project_id] = Catalog(client)
+        return catalog
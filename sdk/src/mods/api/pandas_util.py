@@ -1,54 +1,202 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_numeric_dtype
+from pandas.util import hash_pandas_object
 
 
 def pd_apply_and_insert(df, column_name, func):
     # Apply the function to the specified column
     new_df = func(df[column_name])
 
-    # Rename the new columns
-    new_df.columns = [f"{column_name}.{col}" for col in new_df.columns]
-
     # Find the location of the source column
     col_idx = df.columns.get_loc(column_name)
 
-    # Split the DataFrame into two parts
-    left = df.iloc[:, : col_idx + 1]
-    right = df.iloc[:, col_idx + 1 :]
-
-    # Concatenate the parts with the new DataFrame in between
-    result_df = pd.concat([left, new_df, right], axis=1)
+    # Insert the new columns after it into a shallow copy, so the existing
+    # columns aren't copied
+    result_df = df.copy(deep=False)
+    for i, col in enumerate(new_df.columns, start=1):
+        result_df.insert(
+            col_idx + i,
+            f"{column_name}.{col}",
+            new_df[col],
+            allow_duplicates=True,
+        )
 
     return result_df
 
 
+def categorize(
+    df: pd.DataFrame, max_ratio: float, min_rows: int = 0
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Store string columns with few distinct values as categoricals.
+
+    A column is converted when its distinct values are at most max_ratio of
+    its rows. Returns the new frame and a report of the converted columns with
+    their memory use before and after.
+    """
+    report = []
+    converted = {}
+    if len(df) >= max(min_rows, 1):
+        for col in df.columns:
+            series = df[col]
+            if series.dtype != object or infer_dtype(series, skipna=True) != "string":
+                continue
+            unique = series.nunique(dropna=True)
+            if unique > max_ratio * len(series):
+                continue
+            categorical = series.astype("category")
+            before = int(series.memory_usage(index=False, deep=True))
+            after = int(categorical.memory_usage(index=False, deep=True))
+            converted[col] = categorical
+            report.append((col, unique, before, after, before - after))
+    if converted:
+        df = df.assign(**converted)
+    report_df = pd.DataFrame(
+        report, columns=["column", "unique", "bytes_before", "bytes_after", "saved"]
+    )
+    return df, report_df
+
+
+def _hashable_values(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categoricals hash like their values, unless the categories are nested
+        if infer_dtype(series.cat.categories, skipna=True) in ("string", "empty"):
+            return series
+        return series.astype(str)
+    if series.dtype == object and infer_dtype(series, skipna=True) not in (
+        "string",
+        "empty",
+    ):
+        # Lists, dicts and mixed values can't be hashed directly
+        return series.astype(str)
+    return series
+
+
+def _value_dtype(series: pd.Series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.dtype
+    return series.dtype
+
+
+def _align_dtypes(a: pd.Series, b: pd.Series) -> tuple[pd.Series, pd.Series]:
+    # Hashes depend on the dtype, so compare mismatched columns as a common one
+    a_dtype, b_dtype = _value_dtype(a), _value_dtype(b)
+    if a_dtype == b_dtype:
+        return _hashable_values(a), _hashable_values(b)
+    if all(
+        is_numeric_dtype(dtype) and not is_bool_dtype(dtype)
+        for dtype in (a_dtype, b_dtype)
+    ):
+        return a.astype("float64"), b.astype("float64")
+    return a.astype(str), b.astype(str)
+
+
 def find_rows_with_vals(df, vals_df):
-    df_str = df.astype(str)
-    vals_df_str = vals_df.astype(str)
+    """The rows of df whose values in the columns shared with vals_df match
+    a row of vals_df.
 
+    Rows are compared by a hash of their values, so neither frame is copied.
+    """
     if len(df) == 0:
         return df
+    on = [col for col in df.columns if col in vals_df.columns]
+    if not on:
+        raise ValueError("df and vals_df have no columns in common")
+
+    keys, vals = {}, {}
+    for i, col in enumerate(on):
+        a, b = _align_dtypes(df[col], vals_df[col])
+        keys[i], vals[i] = a.array, b.array
+    row_hashes = hash_pandas_object(pd.DataFrame(keys, copy=False), index=False)
+    val_hashes = hash_pandas_object(pd.DataFrame(vals, copy=False), index=False)
+    return df.loc[np.isin(row_hashes.to_numpy(), val_hashes.to_numpy())]
+
+
+class ColumnTrie:
+    """Flattened column names ("inputs.a.b") indexed by their dotted parts, so
+    the columns under a key prefix are found without scanning all of them."""
+
+    __slots__ = ("children", "column", "_columns")
+
+    def __init__(self, columns: Iterable[str] = ()) -> None:
+        self.children: Dict[str, "ColumnTrie"] = {}
+        # The column ending at this node, if any
+        self.column: Optional[str] = None
+        self._columns: Optional[List[str]] = None
+        for col in columns:
+            node = self
+            for part in col.split("."):
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = ColumnTrie()
+                node = child
+            node.column = col
+
+    def find(self, key_prefix: str) -> Optional["ColumnTrie"]:
+        node: Optional[ColumnTrie] = self
+        for part in key_prefix.split("."):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def columns(self) -> List[str]:
+        """Every column at or under this node."""
+        if self._columns is None:
+            columns = [self.column] if self.column is not None else []
+            for child in self.children.values():
+                columns.extend(child.columns())
+            self._columns = columns
+        return self._columns
+
+
+def _null_to_none(val: Any) -> Any:
+    if val is None or val is pd.NA or val is pd.NaT:
+        return None
+    if isinstance(val, float) and val != val:
+        return None
+    return val
+
+
+def _unflatten_node(node: ColumnTrie, get: Callable[[str], Any]) -> Any:
+    own = get(node.column) if node.column is not None else None
+    if own is not None or not node.children:
+        return own
+    result = {key: _unflatten_node(child, get) for key, child in node.children.items()}
+    if node.column is not None and all(v is None for v in result.values()):
+        # The value itself was null, the nested columns come from other rows
+        return None
+    return result
 
-    merged_df = df_str.merge(vals_df_str, how="left", indicator=True)
-    return df.loc[merged_df["_merge"] == "both"]
-
-
-def get_unflat_value(series: pd.Series, key_prefix: str):
-    # TODO: this drops None which is no good
-    series = series.dropna()
-
-    # Exact match
-    if key_prefix in series.index:
-        return series[key_prefix]
-
-    # Prefixed match
-    prefix_with_dot = key_prefix + "."
-    matched_columns = {
-        col: series[col] for col in series.index if col.startswith(prefix_with_dot)
-    }
-
-    # Remove prefix from keys
-    result = {
-        col[len(prefix_with_dot) :]: value for col, value in matched_columns.items()
-    }
 
-    return result
+def get_unflat_value(
+    series: pd.Series, key_prefix: str, trie: Optional[ColumnTrie] = None
+):
+    """The value at key_prefix of a flattened row, with nested keys rebuilt
+    into dicts. Nulls are kept as None.
+
+    Pass a ColumnTrie of the row's index to avoid rebuilding it.
+    """
+    node = (trie or ColumnTrie(series.index)).find(key_prefix)
+    if node is None:
+        return {}
+    return _unflatten_node(node, lambda col: _null_to_none(series[col]))
+
+
+def unflatten(
+    df: pd.DataFrame, key_prefix: str, trie: Optional[ColumnTrie] = None
+) -> pd.Series:
+    """get_unflat_value for every row of df."""
+    node = (trie or ColumnTrie(df.columns)).find(key_prefix)
+    if node is None:
+        return pd.Series([{} for _ in range(len(df))], index=df.index, dtype=object)
+    columns = node.columns()
+    positions = {col: i for i, col in enumerate(columns)}
+    values = df[columns].to_numpy(dtype=object)
+    result = [
+        _unflatten_node(node, lambda col: _null_to_none(row[positions[col]]))
+        for row in values
+    ]
+    return pd.Series(result, index=df.index, dtype=object)
@@ -1,20 +1,69 @@
+import copy
 import datetime
-import math
-from dataclasses import dataclass
-from typing import Any, Callable, List, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import infer_dtype
+from weave.trace.context import weave_client_context
+from weave.trace.objectify import maybe_objectify
 from weave.trace.refs import ObjectRef, OpRef, parse_uri
+from weave.trace.serialize import from_json
+from weave.trace.vals import make_trace_obj
 from weave.trace.weave_client import WeaveClient
 from weave.trace_server.trace_server_interface import CallsFilter
 
-from mods.api.pandas_util import pd_apply_and_insert
+from mods.api.arrow_util import (
+    ColumnarBuilder,
+    flatten_record,
+    table_to_frame,
+    to_arrow_column,
+)
+from mods.api.pandas_util import (
+    ColumnTrie,
+    categorize,
+    pd_apply_and_insert,
+    unflatten,
+)
+from mods.api.ref_store import get_ref_store
+from mods.api.sampling import weave_client_calls_sample
+from mods.api.single_flight import SingleFlight, canonical_key
+from mods.api.spill import FrameSpiller
 from mods.api.weave_api_next import (
+    Call,
+    Pagination,
     weave_client_calls,
+    weave_client_calls_count,
+    weave_client_calls_filter,
+    weave_client_calls_sharded,
+    weave_client_get_batch,
     weave_client_objs,
     weave_client_ops,
+    weave_client_read_refs,
 )
 
+# Pages kept in flight by paged get_calls reads
+DEFAULT_PREFETCH = 2
+# Concurrent count queries issued by get_op_versions
+COUNT_CONCURRENCY = 8
+
+# Rows built into a frame at a time when get_calls has a memory budget
+SPILL_CHUNK_ROWS = 5_000
+# Rows of a spilled result read to infer column types
+PREVIEW_ROWS = 1_000
+# String columns with at most this fraction of distinct values are stored as
+# categoricals, in frames of at least CATEGORICAL_MIN_ROWS rows
+CATEGORICAL_MAX_RATIO = 0.5
+CATEGORICAL_MIN_ROWS = 100
+
+# Shared by get_calls and get_objs across every session in the process
+_flight = SingleFlight()
+
 ST_HASH_FUNCS = {
     WeaveClient: lambda x: x._project_id(),
     CallsFilter: lambda x: x.model_dump_json(),
@@ -45,10 +94,40 @@ def pd_col_join(df, sep):
 
 
 def is_ref_series(series: pd.Series):
-    return series.str.startswith("weave://").any()
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = pd.Series(series.cat.categories)
+    try:
+        return bool(series.str.startswith("weave://").fillna(False).any())
+    except AttributeError:
+        # Not a column of strings
+        return False
+
+
+REF_PARTS = ["entity", "project", "kind", "name", "version"]
 
 
 def split_obj_ref(series: pd.Series):
+    # A project has few distinct refs, so parse each once and map the parts
+    # back to the rows. Parts are plain strings, get_calls(categorical=True)
+    # is what stores repetitive columns as categoricals.
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+    is_ref = uniques.str.startswith("weave://").fillna(False).astype(bool)
+    if not is_ref.any():
+        parts = pd.DataFrame({part: [None] * len(uniques) for part in REF_PARTS})
+    else:
+        parts = _split_obj_ref_values(uniques.where(is_ref))
+    present = codes >= 0
+    result = {}
+    for col in parts.columns:
+        part_values = parts[col].to_numpy(dtype=object)
+        values = np.full(len(codes), None, dtype=object)
+        values[present] = part_values[codes[present]]
+        result[col] = values
+    return pd.DataFrame(result, index=series.index)
+
+
+def _split_obj_ref_values(series: pd.Series):
     expanded = series.str.split("/", expand=True)
     name_version = expanded[6].str.split(":", expand=True)
     result = pd.DataFrame(
@@ -102,18 +181,49 @@ def get_op_versions(_client: WeaveClient, op: Op, include_call_counts=False):
         for op in client_ops
     ]
     if include_call_counts:
-        calls = get_calls(_client, [o.ref().uri() for o in ops])
-        if len(calls.df):
-            counts = calls.df.groupby("op_name").size()
-            for op in ops:
-                op.call_count = counts.get(op.ref().uri())
-        else:
-            for op in ops:
-                op.call_count = 0
+        add_call_counts(_client, ops)
 
     return list(reversed(ops))
 
 
+def add_call_counts(_client: WeaveClient, ops: List[Op]) -> None:
+    if not ops:
+        return
+
+    # One stats query per version, so counting never downloads calls
+    def count(op: Op) -> int:
+        filter = CallsFilter(op_names=[op.ref().uri()])
+        return weave_client_calls_count(_client, filter)
+
+    max_workers = min(COUNT_CONCURRENCY, len(ops))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for op, call_count in zip(ops, executor.map(count, ops)):
+            op.call_count = call_count
+
+
+def simple_val(v: Any) -> str | List[str] | Dict[str, Any]:
+    if isinstance(v, dict):
+        return {k: simple_val(v) for k, v in v.items()}
+    elif isinstance(v, list):
+        return [simple_val(v) for v in v]
+    elif hasattr(v, "uri"):
+        return v.uri()
+    # elif hasattr(v, "__dict__"):
+    #     return {k: simple_val(v) for k, v in v.__dict__.items()}
+    else:
+        return v
+
+
+def resolve_refs(_client: WeaveClient, refs: List[str]) -> pd.DataFrame:
+    # Resolve the refs and fetch the message.text field
+    # Note we do do this after grouping, so we don't over-fetch refs
+    ref_vals = weave_client_get_batch(_client, refs)
+    ref_vals = simple_val(ref_vals)
+    ref_val_df = pd.json_normalize(ref_vals)
+    ref_val_df.index = refs
+    return ref_val_df
+
+
 @dataclass
 class Objs:
     df: pd.DataFrame
@@ -132,14 +242,29 @@ class Obj:
         return ObjectRef(entity_id, project_id, self.name, self.digest)
 
     def get(self):
-        return self.ref().get()
+        ref = self.ref()
+        if get_ref_store() is None:
+            return ref.get()
+        # Read the value through the ref caches, then wrap it the same way
+        # WeaveClient.get does.
+        client = weave_client_context.require_weave_client()
+        data = weave_client_read_refs(client, [ref.uri()])[ref.uri()]
+        # from_json consumes the dict it decodes, and data is the cached value
+        val = from_json(copy.deepcopy(data), self.project_id, client.server)
+        return maybe_objectify(make_trace_obj(val, ref, client.server, None))
 
     def __repr__(self):
         return f"{self.name}:v{self.version_index}"
 
 
 def get_objs(client, types=None, latest_only=True):
-    client_objs = weave_client_objs(client, types=types, latest_only=latest_only)
+    key = canonical_key("objs", client._project_id(), types, latest_only)
+    client_objs, shared = _flight.do(
+        key, lambda: weave_client_objs(client, types=types, latest_only=latest_only)
+    )
+    if shared:
+        # Like get_calls, each caller (the leader too) gets its own result
+        client_objs = list(client_objs)
     return list(
         reversed(
             sorted(
@@ -159,31 +284,23 @@ def get_objs(client, types=None, latest_only=True):
     )
 
 
+# pandas.api.types.infer_dtype results with a friendlier name
+_INFERRED_DTYPES = {"empty": "empty", "boolean": "bool", "string": "str"}
+
+
 def friendly_dtypes(df):
     # Pandas doesn't allow NaN in bool columns for example. But we want to suggest
     # bool-like columns as target columns for example.
     def detect_dtype(series):
-        non_null_series = series.dropna()
-
-        if non_null_series.empty:
+        if not series.notna().any():
             return "empty"
-
-        # Check for boolean-like columns
-        if all(
-            isinstance(x, bool) or x is None or (isinstance(x, float) and math.isnan(x))
-            for x in series
-        ):
-            return "bool"
-
-        # Check for string-like columns
-        if all(
-            isinstance(x, str) or x is None or (isinstance(x, float) and math.isnan(x))
-            for x in series
-        ):
-            return "str"
-
-        # Fallback to the series' original dtype
-        return series.dtype.name
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # The categories are the distinct values
+            inferred = infer_dtype(series.cat.categories, skipna=True)
+        else:
+            # Scans in C, skipping None and NaN
+            inferred = infer_dtype(series, skipna=True)
+        return _INFERRED_DTYPES.get(inferred, series.dtype.name)
 
     dtypes_dict = {col: detect_dtype(df[col]) for col in df.columns}
     friendly_dtypes_series = pd.Series(dtypes_dict, name="Friendly Dtype")
@@ -196,9 +313,126 @@ class Column:
     type: str
 
 
+# Call fields that are always returned by the server, whatever columns are requested
+CALL_CORE_COLUMNS = ["id", "trace_id", "parent_id", "started_at", "op_name", "ended_at"]
+
+
+def _covers(fetched_columns: Optional[List[str]], column: str) -> bool:
+    if fetched_columns is None or column.split(".")[0] in CALL_CORE_COLUMNS:
+        return True
+    return any(column == f or column.startswith(f + ".") for f in fetched_columns)
+
+
 @dataclass
 class Calls:
+    # Backs the df property assigned below the class. Declared first, so
+    # __init__ resets it before setting df. None until a spilled table is read.
+    _df: Optional[pd.DataFrame] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     df: pd.DataFrame
+    project_id: Optional[str] = None
+    # The call columns requested from the server, None means all of them
+    fetched_columns: Optional[List[str]] = None
+    # Memory mapped result of a get_calls that went over max_memory. df is
+    # only built from it when first accessed, single columns are read directly.
+    table: Optional[pa.Table] = None
+    # friendly_dtypes memo, the frame or table it was computed for (weakly
+    # referenced, so a recycled id can't match) and that frame's dtypes
+    _dtypes: Optional[pd.Series] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _dtypes_source: Optional[weakref.ref] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _dtypes_key: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # column_trie memo, and the columns it was built from
+    _trie: Optional[ColumnTrie] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _trie_key: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Per-model usage in long format (call_id, model, metric, value), when
+    # requested with get_calls(..., usage_by_model=True). df only has the
+    # summary.usage.<metric> totals across models.
+    usage: Optional[pd.DataFrame] = None
+    # String columns stored as categoricals (column, unique, bytes_before,
+    # bytes_after, saved)
+    encoding_report: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_table(
+        cls,
+        table: pa.Table,
+        project_id: Optional[str] = None,
+        fetched_columns: Optional[List[str]] = None,
+        usage: Optional[pd.DataFrame] = None,
+    ) -> "Calls":
+        """Calls backed by a spilled table, whose frame is built on first access."""
+        calls = cls(pd.DataFrame(), project_id, fetched_columns, table, usage=usage)
+        calls._df = None
+        return calls
+
+    def copy(self) -> "Calls":
+        """Calls whose frame and usage can be changed without affecting these.
+
+        A spilled table is shared, Arrow tables are immutable.
+        """
+        df = self._df
+        calls = replace(
+            self,
+            df=pd.DataFrame() if df is None else df.copy(),
+            usage=None if self.usage is None else self.usage.copy(),
+        )
+        if df is None:
+            calls._df = None
+        return calls
+
+    @property
+    def num_rows(self) -> int:
+        if self._df is None and self.table is not None:
+            return self.table.num_rows
+        return len(self.df)
+
+    def _preview(self) -> pd.DataFrame:
+        # Rows to sample values from, without loading a spilled table
+        if self._df is None and self.table is not None:
+            return table_to_frame(self.table.slice(0, PREVIEW_ROWS))
+        return self.df
+
+    def dtypes(self) -> pd.Series:
+        """friendly_dtypes of the calls.
+
+        Recomputed when the frame is replaced or its columns or their dtypes
+        change. Values changed in place without a dtype change aren't noticed.
+        """
+        source: Any
+        if self._df is None and self.table is not None:
+            source = self.table
+            key: tuple = (source.schema,)
+        else:
+            source = self.df
+            key = (len(source), tuple(source.columns), tuple(source.dtypes))
+        cached = self._dtypes_source() if self._dtypes_source is not None else None
+        if self._dtypes is None or cached is not source or key != self._dtypes_key:
+            self._dtypes = self._friendly_dtypes()
+            self._dtypes_source = weakref.ref(source)
+            self._dtypes_key = key
+        return self._dtypes
+
+    def _friendly_dtypes(self) -> pd.Series:
+        if self._df is None and self.table is not None and self.table.num_columns:
+            # One column at a time, so a spilled table isn't loaded whole
+            return pd.concat(
+                [
+                    friendly_dtypes(table_to_frame(self.table.select([i])))
+                    for i in range(self.table.num_columns)
+                ]
+            )
+        return friendly_dtypes(self.df)
 
     def columns(
         # TODO what is the python type for sorted key return value?
@@ -206,7 +440,7 @@ class Calls:
         op_types=None,
         sort_key: Optional[Callable[[Column], Any]] = None,
     ):
-        dtypes = friendly_dtypes(self.df)
+        dtypes = self.dtypes()
         cols = (Column(c, dtypes[c]) for c in dtypes.index)
         if op_types:
             cols = (c for c in cols if dtypes[c.name] in op_types)
@@ -214,12 +448,91 @@ class Calls:
             cols = sorted(cols, key=sort_key)
         return cols
 
+    def fetch_columns(self, columns: List[str]) -> "Calls":
+        """Fetch any of `columns` that get_calls didn't request and add them to df."""
+        missing = [c for c in columns if not _covers(self.fetched_columns, c)]
+        if not missing or self.df.empty:
+            return self
+        if self.project_id is None:
+            raise ValueError("Can't fetch columns for Calls without a project_id")
+        client = weave_client_context.require_weave_client()
+        if client._project_id() != self.project_id:
+            raise ValueError(
+                f"Can't fetch columns for {self.project_id} "
+                f"with a client for {client._project_id()}"
+            )
+        ids = self.df["id"].tolist()
+        extra = get_calls(
+            client,
+            None,
+            calls_filter=CallsFilter(call_ids=ids),
+            limit=len(ids),
+            columns=missing,
+        )
+        if not extra.df.empty:
+            new_columns = [c for c in extra.df.columns if c not in self.df.columns]
+            extra_df = extra.df.drop_duplicates("id").set_index("id")[new_columns]
+            extra_df = extra_df.reindex(self.df["id"])
+            extra_df.index = self.df.index
+            self.df = pd.concat([self.df, extra_df], axis=1)
+        self.fetched_columns = list(self.fetched_columns or []) + missing
+        return self
+
+    def split_refs(self) -> "Calls":
+        """Add entity/project/kind/name/version columns after every ref column.
+
+        op_name is always split by get_calls.
+        """
+        df = self.df
+        for col in list(df.columns):
+            if f"{col}.name" not in df.columns and is_ref_series(df[col]):
+                df = pd_apply_and_insert(df, col, split_obj_ref)
+        self.df = df
+        return self
+
+    def column_trie(self) -> ColumnTrie:
+        """The column names indexed by their dotted parts, rebuilt only when
+        the columns change."""
+        if self._df is None and self.table is not None:
+            names = tuple(self.table.column_names)
+        else:
+            names = tuple(self.df.columns)
+        if self._trie is None or names != self._trie_key:
+            self._trie = ColumnTrie(names)
+            self._trie_key = names
+        return self._trie
+
+    def unflatten(self, key_prefix: str, rows: Optional[Any] = None) -> pd.Series:
+        """The nested value at key_prefix (e.g. "inputs") for each row, or for
+        the rows with the given index labels."""
+        trie = self.column_trie()
+        node = trie.find(key_prefix)
+        if self._df is None and self.table is not None and node is not None:
+            # Only read the columns under the prefix from a spilled result
+            df = table_to_frame(self.table.select(node.columns()))
+        else:
+            df = self.df
+        if rows is not None:
+            df = df.loc[rows]
+        return unflatten(df, key_prefix, trie)
+
+    def __getitem__(self, column: str) -> pd.Series:
+        if (
+            self._df is None
+            and self.table is not None
+            and column in self.table.column_names
+        ):
+            return table_to_frame(self.table.select([column]))[column]
+        return self.fetch_columns([column]).df[column]
+
     def __repr__(self):
+        preview = self._preview()
+
         def format_column_type(col: str, dtype: str) -> str:
             if dtype == "object":
                 # Get first non-null value without scanning entire column
-                mask = self.df[col].notna()
-                sample = self.df[col].iloc[mask.idxmax()] if mask.any() else None
+                mask = preview[col].notna()
+                sample = preview[col].iloc[mask.idxmax()] if mask.any() else None
                 if sample is not None:
                     if isinstance(sample, dict):
                         keys = list(sample.keys())
@@ -240,12 +553,52 @@ class Calls:
             return f"{col}: {dtype}"
 
         dtypes = {
-            col: dtype
-            for col, dtype in friendly_dtypes(self.df).items()
-            if dtype != "empty"
+            col: dtype for col, dtype in self.dtypes().items() if dtype != "empty"
         }
         col_info = [format_column_type(col, dtype) for col, dtype in dtypes.items()]
-        return f"Calls(rows={len(self.df)}, columns=[\n  {',\n  '.join(col_info)}\n])"
+        return f"Calls(rows={self.num_rows}, columns=[\n  {',\n  '.join(col_info)}\n])"
+
+
+def _calls_df(self: Calls) -> pd.DataFrame:
+    if self._df is None:
+        self._df = (
+            table_to_frame(self.table) if self.table is not None else pd.DataFrame()
+        )
+    return self._df
+
+
+def _set_calls_df(self: Calls, df: pd.DataFrame) -> None:
+    self._df = df
+
+
+# Assigned after the dataclass is built, so df stays the constructor argument
+# while a spilled result only builds its frame when first read.
+Calls.df = property(_calls_df, _set_calls_df)  # type: ignore[assignment]
+
+
+def _call_to_dict(c: Call, roots: Optional[List[str]]) -> dict:
+    call_dict = {
+        "id": c.id,
+        "trace_id": c.trace_id,
+        "parent_id": c.parent_id,
+        "started_at": c.started_at,
+        "op_name": c.op_name,
+    }
+    if roots is None or "inputs" in roots:
+        call_dict["inputs"] = {
+            k: v.uri() if hasattr(v, "uri") else v for k, v in c.inputs.items()
+        }
+        call_dict["input_refs"] = c.input_refs
+    if roots is None or "output" in roots:
+        call_dict["output"] = c.output
+    if roots is None or "exception" in roots:
+        call_dict["exception"] = c.exception
+    if roots is None or "attributes" in roots:
+        call_dict["attributes"] = c.attributes
+    if roots is None or "summary" in roots:
+        call_dict["summary"] = c.summary
+    call_dict["ended_at"] = c.ended_at
+    return call_dict
 
 
 def get_calls(
@@ -256,59 +609,321 @@ def get_calls(
     trace_roots_only: bool | None = None,
     limit: int | None = None,
     callback: Optional[Callable[[int], None]] = None,
+    prefetch: int | None = None,
+    pagination: Pagination | None = None,
+    stream: bool | None = None,
+    columns: List[str] | None = None,
+    expand_columns: List[str] | None = None,
+    shards: int = 1,
+    sample: int | None = None,
+    stratify_by: str | None = None,
+    seed: int | None = None,
+    max_memory: int | None = None,
+    usage_by_model: bool = False,
+    categorical: bool = False,
 ):
+    if calls_filter is None:
+        calls_filter = weave_client_calls_filter(
+            _client, op_name_uris(op_name), input_refs, trace_roots_only
+        )
+    _, server_columns = server_columns_for(columns)
+    prefetch, pagination, stream = transport_options(prefetch, pagination, stream)
+
+    def fetch() -> Calls:
+        if sample is not None:
+            # sample calls, or sample calls per stratify_by value
+            calls = weave_client_calls_sample(
+                _client,
+                calls_filter,
+                sample,
+                stratify_by,
+                limit=limit,
+                callback=callback,
+                columns=server_columns,
+                expand_columns=expand_columns,
+                lazy=True,
+                seed=seed,
+            )
+            return calls_to_frame(
+                calls,
+                _client._project_id(),
+                columns,
+                max_memory,
+                usage_by_model,
+                categorical,
+            )
+        if shards > 1:
+            # Split the started_at range and fetch the windows in parallel
+            calls = weave_client_calls_sharded(
+                _client,
+                calls_filter,
+                shards,
+                limit=limit,
+                callback=callback,
+                columns=server_columns,
+                expand_columns=expand_columns,
+                lazy=True,
+            )
+            return calls_to_frame(
+                calls,
+                _client._project_id(),
+                columns,
+                max_memory,
+                usage_by_model,
+                categorical,
+            )
+        calls = weave_client_calls(
+            _client,
+            trace_server_filt=calls_filter,
+            limit=limit,
+            callback=callback,
+            prefetch=prefetch,
+            pagination=pagination,
+            stream=stream,
+            columns=server_columns,
+            expand_columns=expand_columns,
+            # Only decode inputs for the rows we actually read them from
+            lazy=True,
+        )
+        return calls_to_frame(
+            calls,
+            _client._project_id(),
+            columns,
+            max_memory,
+            usage_by_model,
+            categorical,
+        )
+
+    # Identical concurrent requests share one fetch. When it was shared, every
+    # caller (the leader too) gets its own frame, copied from a result nobody
+    # mutates. callback only reports the progress of the caller that fetched.
+    key = canonical_key(
+        "calls",
+        _client._project_id(),
+        calls_filter,
+        limit,
+        columns,
+        expand_columns,
+        shards > 1,
+        sample,
+        stratify_by,
+        seed,
+        max_memory,
+        usage_by_model,
+        categorical,
+    )
+    result, shared = _flight.do(key, fetch)
+    return result.copy() if shared else result
+
+
+def get_calls_column(
+    _client: WeaveClient,
+    op_name: str | List[str] | List[Op] | None,
+    column: str,
+    input_refs: list[str] | str | None = None,
+    calls_filter: CallsFilter | None = None,
+    trace_roots_only: bool | None = None,
+    limit: int | None = None,
+    callback: Optional[Callable[[int], None]] = None,
+    prefetch: int | None = None,
+    stream: bool | None = None,
+) -> pa.Array:
+    """Fetch a single dotted column, e.g. "summary.weave.latency_ms".
+
+    Only the column's root is requested from the server and no frame is built.
+    Scalars come back as a typed Arrow array, anything else as JSON strings.
+    Use .to_numpy(zero_copy_only=False) for NumPy, nulls (e.g. the latency of
+    running calls) can't be converted without a copy.
+    """
+    _, server_columns = server_columns_for([column])
+    prefetch, _, stream = transport_options(prefetch, None, stream)
+    calls = weave_client_calls(
+        _client,
+        op_name_uris(op_name),
+        input_refs,
+        calls_filter,
+        trace_roots_only,
+        limit,
+        callback,
+        prefetch,
+        stream=stream,
+        columns=server_columns,
+    )
+    return to_arrow_column(list(calls.values(column)))
+
+
+def transport_options(
+    prefetch: int | None, pagination: Pagination | None, stream: bool | None
+) -> tuple[int, Pagination, bool]:
+    """Resolve how get_calls reads calls.
+
+    Calls are streamed in one request unless stream=False, or prefetch or
+    pagination is given, which select paged reads (prefetching 2 pages by
+    default). Asking for both is an error.
+    """
+    paged = prefetch is not None or pagination is not None
+    if stream is None:
+        stream = not paged
+    if stream:
+        if paged:
+            raise ValueError(
+                "prefetch and pagination apply to paged reads, not stream=True"
+            )
+        return 0, "offset", True
+    return (
+        DEFAULT_PREFETCH if prefetch is None else prefetch,
+        pagination or "offset",
+        False,
+    )
+
+
+def op_name_uris(op_name: str | List[str] | List[Op] | None) -> List[str] | None:
     if isinstance(op_name, list):
-        if all(type(op_name).__name__ == "Op" for o in op_name):
-            op_names = [o.ref().uri() for o in op_name]
-        else:
-            op_names = op_name
-    else:
-        if type(op_name).__name__ == "Op":
-            op_names = [op_name.ref().uri()]
-        else:
-            op_names = [op_name] if op_name else None
-    call_list = [
-        {
-            "id": c.id,
-            "trace_id": c.trace_id,
-            "parent_id": c.parent_id,
-            "started_at": c.started_at,
-            "op_name": c.op_name,
-            "inputs": {
-                k: v.uri() if hasattr(v, "uri") else v for k, v in c.inputs.items()
-            },
-            "input_refs": c.input_refs,
-            "output": c.output,
-            "exception": c.exception,
-            "attributes": c.attributes,
-            "summary": c.summary,
-            "ended_at": c.ended_at,
+        if all(type(o).__name__ == "Op" for o in op_name):
+            return [o.ref().uri() for o in op_name]
+        return op_name
+    if type(op_name).__name__ == "Op":
+        return [op_name.ref().uri()]
+    return [op_name] if op_name else None
+
+
+def server_columns_for(
+    columns: List[str] | None,
+) -> tuple[List[str] | None, List[str] | None]:
+    # The server only selects top level call fields, so request the roots of
+    # any dotted columns and trim the flattened frame afterwards.
+    if not columns:
+        return None, None
+    roots = sorted({c.split(".")[0] for c in columns})
+    server_columns = roots + ["ended_at"]
+    if "summary" in roots:
+        # The derived summary.weave fields (status, latency) are computed
+        # from these.
+        server_columns.append("exception")
+    return roots, server_columns
+
+
+class UsageBuilder:
+    """Collect per-model usage as a long table: call_id, model, metric, value."""
+
+    def __init__(self) -> None:
+        self._rows: Dict[str, list] = {
+            "call_id": [],
+            "model": [],
+            "metric": [],
+            "value": [],
         }
-        for c in weave_client_calls(
-            _client,
-            op_names,
-            input_refs,
-            calls_filter,
-            trace_roots_only,
-            limit,
-            callback,
+
+    def append(self, c: Call) -> None:
+        usage = (c.summary or {}).get("usage")
+        if not isinstance(usage, dict):
+            return
+        for model, metrics in usage.items():
+            if not isinstance(metrics, dict):
+                continue
+            for metric, value in flatten_record(metrics).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self._rows["call_id"].append(c.id)
+                    self._rows["model"].append(model)
+                    self._rows["metric"].append(metric)
+                    self._rows["value"].append(value)
+
+    def to_df(self) -> pd.DataFrame:
+        df = pd.DataFrame(self._rows)
+        for col in ("model", "metric"):
+            df[col] = df[col].astype("category")
+        df["value"] = pd.to_numeric(df["value"])
+        return df
+
+
+def calls_to_frame(
+    calls: Iterable[Call],
+    project_id: str,
+    columns: List[str] | None = None,
+    max_memory: Optional[int] = None,
+    usage_by_model: bool = False,
+    categorical: bool = False,
+) -> Calls:
+    roots, _ = server_columns_for(columns)
+    builder = ColumnarBuilder()
+    usage = UsageBuilder() if usage_by_model else None
+
+    def in_memory(df: pd.DataFrame) -> Calls:
+        report = None
+        if categorical:
+            df, report = categorize(df, CATEGORICAL_MAX_RATIO, CATEGORICAL_MIN_ROWS)
+        return Calls(
+            df,
+            project_id,
+            columns,
+            usage=usage.to_df() if usage is not None else None,
+            encoding_report=report,
         )
-    ]
-    df = pd.json_normalize(call_list)
 
+    if max_memory is None:
+        for c in calls:
+            builder.append(_call_to_dict(c, roots))
+            if usage is not None:
+                usage.append(c)
+        return in_memory(_finish_frame(builder.to_df(), columns))
+
+    # Build the frame in chunks, which spill to disk past the budget. With
+    # categorical, spilled string columns are dictionary encoded instead.
+    spiller = FrameSpiller(max_memory, categorical)
+    for c in calls:
+        builder.append(_call_to_dict(c, roots))
+        if usage is not None:
+            usage.append(c)
+        if len(builder) >= SPILL_CHUNK_ROWS:
+            spiller.add(_finish_frame(builder.to_df(), columns))
+            builder = ColumnarBuilder()
+    if len(builder):
+        spiller.add(_finish_frame(builder.to_df(), columns))
+    if not spiller.spilled:
+        return in_memory(_fill_usage_frame(spiller.frame()))
+    result = Calls.from_table(
+        _fill_usage_table(spiller.table()),
+        project_id,
+        columns,
+        usage=usage.to_df() if usage is not None else None,
+    )
+    # Copies of the result share the table, the files go with it
+    weakref.finalize(result.table, spiller.cleanup)
+    return result
+
+
+# Usage totals are summed per chunk, and chunks without usage don't have the
+# columns. A call without usage has a total of 0, as in an unchunked frame.
+def _fill_usage_frame(df: pd.DataFrame) -> pd.DataFrame:
+    usage_columns = [c for c in df.columns if c.startswith("summary.usage.")]
+    if usage_columns:
+        df[usage_columns] = df[usage_columns].fillna(0)
+    return df
+
+
+def _fill_usage_table(table: pa.Table) -> pa.Table:
+    for i, usage_field in enumerate(table.schema):
+        if usage_field.name.startswith("summary.usage.") and table.column(i).null_count:
+            filled = pc.fill_null(table.column(i), 0)
+            table = table.set_column(i, usage_field, filled)
+    return table
+
+
+def _finish_frame(df: pd.DataFrame, columns: List[str] | None) -> pd.DataFrame:
     if df.empty:
-        return Calls(df)
+        return df
     df = pd_apply_and_insert(df, "op_name", split_obj_ref)
 
     # Merge the usage columns, removing the model component
     usage_columns = [col for col in df.columns if col.startswith("summary.usage")]
-    renamed_columns = [
-        f"summary.usage.{col.split('.')[-1]}"  # Keep only the metric name (last component)
-        for col in usage_columns
-    ]
-    df_renamed = df[usage_columns].copy()
-    df_renamed.columns = renamed_columns
-    df_summed = df_renamed.T.groupby(level=0).sum().T
+    by_metric: Dict[str, List[str]] = {}
+    for col in usage_columns:
+        # Keep only the metric name (last component)
+        by_metric.setdefault(f"summary.usage.{col.split('.')[-1]}", []).append(col)
+    df_summed = pd.DataFrame(
+        {name: df[cols].sum(axis=1) for name, cols in sorted(by_metric.items())},
+        index=df.index,
+    )
     df_final = df.drop(columns=usage_columns).join(df_summed)
     # Sum up duplicate columns
     """
@@ -321,4 +936,7 @@ def get_calls(
         df_final = df_final.drop(columns=df_final.columns[dup_indices])
     """
 
-    return Calls(df_final)
+    if columns:
+        df_final = df_final[[c for c in df_final.columns if _covers(columns, c)]]
+
+    return df_final
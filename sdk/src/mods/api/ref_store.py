@@ -0,0 +1,70 @@
+"""An optional on-disk store of digest-pinned ref values.
+
+Values are keyed by full ref uri and stored zlib compressed in a sqlite file
+under MODS_CACHE_DIR, so restarted containers and other worker processes read
+immutable objects without a server round-trip. Enable it with
+enable_ref_store() or by setting MODS_REF_STORE=1.
+"""
+
+import json
+import os
+import zlib
+from contextlib import closing
+from typing import Any, Iterable, Optional
+
+from mods.api.sqlite_util import CACHE_DIR, connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    uri TEXT PRIMARY KEY,
+    val BLOB NOT NULL
+);
+"""
+
+# sqlite limits the number of bound parameters per statement
+_MAX_PARAMS = 900
+
+
+class RefStore:
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or os.path.join(CACHE_DIR, "refs.sqlite")
+        with closing(connect(self.path)) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def get_many(self, uris: Iterable[str]) -> dict[str, Any]:
+        uris = list(uris)
+        found = {}
+        with closing(connect(self.path)) as conn:
+            for i in range(0, len(uris), _MAX_PARAMS):
+                chunk = uris[i : i + _MAX_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT uri, val FROM refs WHERE uri IN ({placeholders})", chunk
+                )
+                for uri, val in rows:
+                    found[uri] = json.loads(zlib.decompress(val))
+        return found
+
+    def put_many(self, items: dict[str, Any]) -> None:
+        if not items:
+            return
+        rows = [
+            (uri, zlib.compress(json.dumps(val).encode())) for uri, val in items.items()
+        ]
+        with closing(connect(self.path)) as conn, conn:
+            conn.executemany("INSERT OR IGNORE INTO refs VALUES (?, ?)", rows)
+
+
+_ref_store: Optional[RefStore] = None
+
+
+def enable_ref_store(path: Optional[str] = None) -> RefStore:
+    global _ref_store
+    _ref_store = RefStore(path)
+    return _ref_store
+
+
+def get_ref_store() -> Optional[RefStore]:
+    if _ref_store is None and os.getenv("MODS_REF_STORE", "") not in ("", "0"):
+        return enable_ref_store()
+    return _ref_store
@@ -0,0 +1,154 @@
+"""Uniform and stratified samples of calls.
+
+An unstratified sample picks row offsets uniformly at random from the
+filter's count and requests only those rows, so the cost grows with the
+sample size, not the project size. A stratified sample has to see every row
+to learn the strata, so it streams the calls through a reservoir per stratum.
+"""
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from weave.trace.weave_client import WeaveClient
+from weave.trace_server.trace_server_interface import (
+    CallSchema,
+    CallsFilter,
+    CallsQueryReq,
+    SortBy,
+)
+
+from mods.api.weave_api_next import (
+    PAGE_SIZE,
+    Call,
+    CallsIter,
+    call_field,
+    make_client_call,
+    make_lazy_client_call,
+    weave_client_calls_count,
+)
+
+# Concurrent requests for the rows picked by an offset sample
+SAMPLE_CONCURRENCY = 4
+
+
+def reservoir_sample(
+    rows: Iterable[CallSchema],
+    n: int,
+    key: Optional[Callable[[CallSchema], Any]] = None,
+    rng: Optional[random.Random] = None,
+) -> List[CallSchema]:
+    """Keep a uniform sample of n rows per key in one pass (algorithm R).
+
+    Rows are returned in the order they were read.
+    """
+    rng = rng or random.Random()
+    reservoirs: Dict[Any, list[tuple[int, CallSchema]]] = {}
+    seen: Dict[Any, int] = {}
+    for i, row in enumerate(rows):
+        k = key(row) if key is not None else None
+        if isinstance(k, (list, dict)):
+            k = repr(k)
+        reservoir = reservoirs.setdefault(k, [])
+        count = seen[k] = seen.get(k, 0) + 1
+        if len(reservoir) < n:
+            reservoir.append((i, row))
+        else:
+            j = rng.randrange(count)
+            if j < n:
+                reservoir[j] = (i, row)
+    sampled = sorted(
+        (item for reservoir in reservoirs.values() for item in reservoir),
+        key=lambda item: item[0],
+    )
+    return [row for _, row in sampled]
+
+
+def _offset_runs(offsets: List[int], max_run: int) -> List[tuple[int, int]]:
+    # Group sorted offsets into (start, stop) requests no longer than max_run
+    runs: List[tuple[int, int]] = []
+    for offset in offsets:
+        if runs and offset - runs[-1][0] < max_run:
+            runs[-1] = (runs[-1][0], offset + 1)
+        else:
+            runs.append((offset, offset + 1))
+    return runs
+
+
+def weave_client_calls_sample(
+    self: WeaveClient,
+    filter: CallsFilter,
+    n: int,
+    stratify_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    callback: Optional[Callable[[int], None]] = None,
+    columns: List[str] | None = None,
+    expand_columns: List[str] | None = None,
+    lazy: bool = False,
+    seed: Optional[int] = None,
+) -> Iterator[Call]:
+    """A uniform sample of n calls, or of n calls per stratify_by value.
+
+    With limit, the sample is drawn from the first limit calls.
+    """
+    rng = random.Random(seed)
+    project_id = self._project_id()
+    entity, project = project_id.split("/")
+    make_call = make_lazy_client_call if lazy else make_client_call
+    if stratify_by is not None:
+        if columns is not None:
+            root = stratify_by.split(".")[0]
+            columns = columns + [root] if root not in columns else columns
+        rows = CallsIter(
+            self.server,
+            project_id,
+            filter,
+            columns=columns,
+            limit=limit or sys.maxsize,
+            callback=callback,
+            stream=True,
+            expand_columns=expand_columns,
+        ).server_calls()
+        sample = reservoir_sample(
+            rows, n, key=lambda row: call_field(row, stratify_by), rng=rng
+        )
+        for row in sample:
+            yield make_call(entity, project, row, self.server)
+        return
+
+    count = weave_client_calls_count(self, filter)
+    if limit is not None:
+        count = min(count, limit)
+    offsets = sorted(rng.sample(range(count), min(n, count)))
+    wanted = set(offsets)
+
+    def fetch(run: tuple[int, int]) -> list[CallSchema]:
+        start, stop = run
+        response = self.server.calls_query(
+            CallsQueryReq(
+                project_id=project_id,
+                filter=filter,
+                # A fixed order, so offsets mean the same thing in every request
+                sort_by=[
+                    SortBy(field="started_at", direction="asc"),
+                    SortBy(field="id", direction="asc"),
+                ],
+                offset=start,
+                limit=stop - start,
+                columns=columns,
+                expand_columns=expand_columns,
+            )
+        )
+        return [
+            row for offset, row in enumerate(response.calls, start) if offset in wanted
+        ]
+
+    total = 0
+    with ThreadPoolExecutor(max_workers=SAMPLE_CONCURRENCY) as executor:
+        for rows in executor.map(fetch, _offset_runs(offsets, PAGE_SIZE)):
+            total += len(rows)
+            if callback:
+                callback(total)
+            for row in rows:
+                yield make_call(entity, project, row, self.server)
@@ -0,0 +1,79 @@
+"""Coalesce concurrent identical fetches into one.
+
+When several sessions open a mod at once they all miss their caches and ask
+the trace server the same question. A SingleFlight lets the first caller run
+the fetch while callers with the same key wait for its result.
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+def _canonical(val: Any) -> Any:
+    if isinstance(val, dict):
+        return {str(k): _canonical(v) for k, v in val.items()}
+    if isinstance(val, list):
+        # Filter fields are sets of alternatives, so order doesn't matter
+        return sorted((_canonical(v) for v in val), key=json.dumps)
+    return val
+
+
+def canonical_key(*parts: Any) -> str:
+    """A stable key for request parameters.
+
+    Filters (pydantic models) compare regardless of the order of their list
+    fields, other parts are compared as given.
+    """
+    spec = [
+        _canonical(p.model_dump(mode="json", exclude_none=True))
+        if isinstance(p, BaseModel)
+        else p
+        for p in parts
+    ]
+    encoded = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        # Followers waiting on each key's leader
+        self._waiting: Dict[Hashable, int] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Run fn, or wait for the call already running under key.
+
+        Returns the result and whether it was shared with another caller, for
+        the leader as well as its followers. Errors are raised to every
+        waiting caller.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self._waiting[key] = 0
+            else:
+                self._waiting[key] += 1
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                followers = self._waiting.pop(key)
+        return result, followers > 0
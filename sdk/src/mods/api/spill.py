@@ -0,0 +1,67 @@
+"""Keep large results under a memory budget by spilling them to disk.
+
+Frames are held in memory until their total size passes the budget. From then
+on every frame, including the ones already held, is written to its own Arrow
+IPC file and read back memory mapped, so the pages are owned by the OS page
+cache instead of the process.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from mods.api.arrow_util import concat_tables, frame_to_table
+
+
+class FrameSpiller:
+    def __init__(self, max_memory: int, categorical: bool = False) -> None:
+        self.max_memory = max_memory
+        self.categorical = categorical
+        self.dir: Optional[str] = None
+        self._frames: List[pd.DataFrame] = []
+        self._tables: List[pa.Table] = []
+        self._bytes = 0
+
+    @property
+    def spilled(self) -> bool:
+        return self.dir is not None
+
+    def add(self, df: pd.DataFrame) -> None:
+        if self.dir is not None:
+            self._write(df)
+            return
+        self._frames.append(df)
+        self._bytes += int(df.memory_usage(deep=True).sum())
+        if self._bytes > self.max_memory:
+            self.dir = tempfile.mkdtemp(prefix="mods-calls-")
+            frames, self._frames = self._frames, []
+            for frame in frames:
+                self._write(frame)
+
+    def _write(self, df: pd.DataFrame) -> None:
+        path = os.path.join(self.dir, f"{len(self._tables)}.arrow")
+        table = frame_to_table(df, self.categorical)
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        self._tables.append(pa.ipc.open_file(pa.memory_map(path)).read_all())
+
+    def frame(self) -> pd.DataFrame:
+        """The frames added so far, when nothing was spilled."""
+        if not self._frames:
+            return pd.DataFrame()
+        if len(self._frames) == 1:
+            return self._frames[0]
+        return pd.concat(self._frames, ignore_index=True)
+
+    def table(self) -> pa.Table:
+        """The memory mapped table of everything added, once spilled."""
+        return concat_tables(self._tables)
+
+    def cleanup(self) -> None:
+        if self.dir is not None:
+            shutil.rmtree(self.dir, ignore_errors=True)
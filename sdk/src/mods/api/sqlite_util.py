@@ -0,0 +1,14 @@
+import os
+import sqlite3
+
+# Shared on-disk cache location, /app/.cache/mods inside mod containers
+CACHE_DIR = os.getenv("MODS_CACHE_DIR", os.path.expanduser("~/.cache/mods"))
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a sqlite database that several processes can read and write."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
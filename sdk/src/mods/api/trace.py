@@ -0,0 +1,125 @@
+"""Whole traces loaded in one query, with the call tree indexed in memory.
+
+Walking a trace with Call.children() costs one request per call. get_traces
+fetches every call of the given traces with a single trace_ids filter and
+builds the parent/child index once, so tree walks, subtree and ancestor
+lookups don't go back to the server.
+"""
+
+import sys
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
+
+from weave.trace.weave_client import WeaveClient
+from weave.trace_server.trace_server_interface import CallsFilter
+
+from mods.api.weave_api_next import Call, weave_client_calls
+
+
+class Trace:
+    def __init__(self, trace_id: str, calls: List[Call]) -> None:
+        self.trace_id = trace_id
+        self.calls: Dict[str, Call] = {}
+        self._children: Dict[str, List[Call]] = defaultdict(list)
+        self.roots: List[Call] = []
+        for call in sorted(calls, key=lambda c: (c.started_at, c.id)):
+            self.calls[call.id] = call
+        for call in self.calls.values():
+            if call.parent_id is not None and call.parent_id in self.calls:
+                self._children[call.parent_id].append(call)
+            else:
+                # Parents that aren't in the trace (not logged yet, or from
+                # another trace) make their children roots.
+                self.roots.append(call)
+
+        # Pre-order walk: every call comes after its parent and before its
+        # later siblings.
+        self.depths: Dict[str, int] = {}
+        self.order: List[Call] = []
+        stack = [(root, 0) for root in reversed(self.roots)]
+        while stack:
+            call, depth = stack.pop()
+            self.depths[call.id] = depth
+            self.order.append(call)
+            for child in reversed(self._children.get(call.id, [])):
+                stack.append((child, depth + 1))
+        self._position = {call.id: i for i, call in enumerate(self.order)}
+        self._subtree_end = {}
+        for call in reversed(self.order):
+            end = self._position[call.id] + 1
+            children = self._children.get(call.id)
+            if children:
+                end = self._subtree_end[children[-1].id]
+            self._subtree_end[call.id] = end
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    def __iter__(self) -> Iterator[Call]:
+        return iter(self.order)
+
+    def __getitem__(self, call_id: str) -> Call:
+        return self.calls[call_id]
+
+    def __repr__(self) -> str:
+        return f"<Trace {self.trace_id}: {len(self)} calls>"
+
+    def children(self, call_id: str) -> List[Call]:
+        return list(self._children.get(call_id, []))
+
+    def parent(self, call_id: str) -> Optional[Call]:
+        parent_id = self.calls[call_id].parent_id
+        return self.calls.get(parent_id) if parent_id is not None else None
+
+    def depth(self, call_id: str) -> int:
+        return self.depths[call_id]
+
+    def subtree(self, call_id: str) -> List[Call]:
+        """The call and all its descendants, in pre-order."""
+        return self.order[self._position[call_id] : self._subtree_end[call_id]]
+
+    def ancestors(self, call_id: str) -> List[Call]:
+        """The call's parent, its parent's parent and so on up to the root."""
+        ancestors = []
+        parent = self.parent(call_id)
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self.parent(parent.id)
+        return ancestors
+
+    def walk(self) -> Iterator[tuple[Call, int]]:
+        """Yield (call, depth) pairs in pre-order."""
+        for call in self.order:
+            yield call, self.depths[call.id]
+
+
+def get_traces(
+    _client: WeaveClient,
+    trace_ids: List[str],
+    columns: List[str] | None = None,
+) -> Dict[str, Trace]:
+    """Fetch every call of the given traces in one query."""
+    if not trace_ids:
+        return {}
+    if columns is not None:
+        columns = list(
+            dict.fromkeys(columns + ["id", "trace_id", "parent_id", "started_at"])
+        )
+    calls = weave_client_calls(
+        _client,
+        trace_server_filt=CallsFilter(trace_ids=list(trace_ids)),
+        limit=sys.maxsize,
+        stream=True,
+        columns=columns,
+        lazy=True,
+    )
+    by_trace: Dict[str, List[Call]] = {trace_id: [] for trace_id in trace_ids}
+    for call in calls:
+        by_trace.setdefault(call.trace_id, []).append(call)
+    return {trace_id: Trace(trace_id, calls) for trace_id, calls in by_trace.items()}
+
+
+def get_trace(
+    _client: WeaveClient, trace_id: str, columns: List[str] | None = None
+) -> Trace:
+    return get_traces(_client, [trace_id], columns)[trace_id]
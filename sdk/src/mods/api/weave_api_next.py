@@ -1,25 +1,76 @@
 # This contains code that needs to be added to the weave Python package.
 # But its here for now so we can iterate on finding the right patterns.
 
+import asyncio
+import copy
 import dataclasses
 import datetime
-from typing import Any, Callable, Iterator, List, Optional, Sequence, Union, cast
+import itertools
+import math
+import re
+import threading
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+    overload,
+)
 
 from weave.trace import urls, weave_client
+from weave.trace.refs import ObjectRef, TableRef, parse_uri
 from weave.trace.weave_client import WeaveClient, from_json
+from weave.trace_server.interface.query import Query
 from weave.trace_server.trace_server_interface import (
     CallSchema,
     CallsFilter,
     CallsQueryReq,
+    CallsQueryStatsReq,
     ObjectVersionFilter,
     ObjQueryReq,
     ObjQueryRes,
     ObjSchema,
     RefsReadBatchReq,
+    SortBy,
     TraceServerInterface,
 )
 from weave.trace_server.trace_server_interface_util import extract_refs_from_values
 
+from mods.api.ref_store import get_ref_store
+
+PAGE_SIZE = 200
+# Calls read when no limit is given
+DEFAULT_LIMIT = 10_000
+
+# Refs per refs_read_batch request, and how many of those run at once
+REFS_BATCH_SIZE = 500
+REFS_BATCH_CONCURRENCY = 4
+# Number of digest-pinned ref values kept in memory
+REF_CACHE_SIZE = 10_000
+# Started_at windows fetched at once by weave_client_calls_sharded
+SHARD_CONCURRENCY = 8
+# Weave digests are base64 sha256 hashes, aliases like "latest" or "v3" aren't
+DIGEST_RE = re.compile(r"[A-Za-z0-9]{32,}")
+
+Pagination = Literal["offset", "keyset"]
+# (last started_at seen, ids of the calls seen at or within KEYSET_MARGIN
+# before that started_at)
+KeysetCursor = tuple[datetime.datetime, set[str]]
+# Server side started_at bounds are widened by this much, so rounding in the
+# literal can't drop rows at the bound. Rows are then filtered exactly here.
+KEYSET_MARGIN = datetime.timedelta(milliseconds=1)
+
 
 @dataclasses.dataclass
 class Call:
@@ -84,6 +135,7 @@ def make_client_call(
         inputs=inputs,
         input_refs=input_refs,
         output=output,
+        exception=server_call.exception,
         summary=server_call.summary,
         attributes=server_call.attributes,
     )
@@ -92,6 +144,64 @@ def make_client_call(
     return call
 
 
+class LazyCall(Call):
+    """A Call that keeps the raw server payload and decodes inputs on first access.
+
+    Scans that only read ids, timestamps, outputs or summaries skip the
+    from_json and ref extraction work over the inputs tree.
+    """
+
+    _UNSET: Any = object()
+
+    def __init__(self, server_call: CallSchema, server: TraceServerInterface) -> None:
+        self._server_call = server_call
+        self._server = server
+        self._inputs = LazyCall._UNSET
+        self._input_refs = LazyCall._UNSET
+        self.op_name = server_call.op_name
+        self.started_at = server_call.started_at
+        self.ended_at = server_call.ended_at
+        self.trace_id = server_call.trace_id
+        self.project_id = server_call.project_id
+        self.parent_id = server_call.parent_id
+        self.id = server_call.id
+        self.output = server_call.output
+        self.exception = server_call.exception
+        self.summary = server_call.summary
+        self.attributes = server_call.attributes
+        self._children = []
+
+    @property  # type: ignore[override]
+    def inputs(self) -> dict:
+        if self._inputs is LazyCall._UNSET:
+            self._inputs = from_json(
+                self._server_call.inputs, self._server_call.project_id, self._server
+            )
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, value: dict) -> None:
+        self._inputs = value
+
+    @property  # type: ignore[override]
+    def input_refs(self) -> list[str]:
+        if self._input_refs is LazyCall._UNSET:
+            self._input_refs = extract_refs_from_values(self._server_call.inputs)
+        return self._input_refs
+
+    @input_refs.setter
+    def input_refs(self, value: list[str]) -> None:
+        self._input_refs = value
+
+
+def make_lazy_client_call(
+    entity: str, project: str, server_call: CallSchema, server: TraceServerInterface
+) -> Call:
+    if server_call.id is None:
+        raise ValueError("Call ID is None")
+    return LazyCall(server_call, server)
+
+
 class CallsIter:
     server: TraceServerInterface
     filter: CallsFilter
@@ -107,55 +217,531 @@ class CallsIter:
         columns: List[str] | None = None,
         limit: int | None = None,
         callback: Optional[Callable[[int], None]] = None,
+        prefetch: int = 0,
+        page_size: int = PAGE_SIZE,
+        pagination: Pagination = "offset",
+        stream: bool = False,
+        expand_columns: List[str] | None = None,
+        lazy: bool = False,
+        after: Optional[KeysetCursor] = None,
+        page_cache: int = 0,
+        before: Optional[datetime.datetime] = None,
     ) -> None:
+        if stream and (prefetch > 0 or pagination != "offset"):
+            raise ValueError(
+                "prefetch and pagination apply to paged reads, not stream=True"
+            )
         self.server = server
         self.project_id = project_id
         self.filter = filter
         self._columns = columns
+        self._expand_columns = expand_columns
         # TODO: Probably make this bigger
-        self._limit = limit or 10_000
+        self._limit = limit or DEFAULT_LIMIT
         self._callback = callback
+        # Number of pages kept in flight on a background pool while the
+        # current page is being deserialized. 0 fetches pages sequentially.
+        self._prefetch = prefetch
+        self._page_size = page_size
+        # "offset" pages by row offset, "keyset" sorts by started_at and asks
+        # for rows after the last seen key so deep pages stay cheap and rows
+        # inserted mid-scan can't shift across page boundaries.
+        self._pagination = pagination
+        # Keyset cursor to resume a previous scan from, and an exclusive
+        # started_at upper bound for the scan
+        if after is not None:
+            after = (as_utc(after[0]), after[1])
+        self._after = after
+        self._before = as_utc(before) if before is not None else None
+        # Read from calls_query_stream in a single request instead of paging;
+        # rows are still grouped into page_size chunks for the callback.
+        self._stream = stream
+        # Yield LazyCall objects that only decode inputs when accessed
+        self._make_call = make_lazy_client_call if lazy else make_client_call
+        # Number of offset pages kept for random access and re-iteration, so
+        # paging back and forth doesn't refetch.
+        self._page_cache = LRUCache(page_cache) if page_cache > 0 else None
 
-    def __getitem__(self, key: Union[slice, int]) -> Call:
+    @overload
+    def __getitem__(self, key: int) -> Call: ...
+    @overload
+    def __getitem__(self, key: slice) -> list[Call]: ...
+    def __getitem__(self, key: Union[slice, int]) -> Call | list[Call]:
+        # Rows are addressed by offset in the server's default order, and only
+        # the pages covering the requested rows are fetched.
+        entity, project = self.project_id.split("/")
         if isinstance(key, slice):
-            raise NotImplementedError("Slicing not supported")
-        for i, call in enumerate(self):
-            if i == key:
-                return call
-        raise IndexError(f"Index {key} out of range")
+            start, stop, step = key.indices(self._length_hint(key))
+            if step < 0:
+                rows = self._rows(stop + 1, start + 1)[::step]
+            else:
+                rows = self._rows(start, stop)[::step]
+            return [self._make_call(entity, project, c, self.server) for c in rows]
+        index = key
+        if index < 0:
+            index += self._count()
+        rows = self._rows(index, index + 1) if 0 <= index < self._limit else []
+        if not rows:
+            raise IndexError(f"Index {key} out of range")
+        return self._make_call(entity, project, rows[0], self.server)
+
+    def _count(self) -> int:
+        response = self.server.calls_query_stats(
+            CallsQueryStatsReq(project_id=self.project_id, filter=self.filter)
+        )
+        return min(response.count, self._limit)
+
+    def _length_hint(self, key: slice) -> int:
+        # The total is only needed for negative or open ended bounds
+        step = key.step or 1
+        open_ended = key.stop is None if step > 0 else key.start is None
+        negative = any(i is not None and i < 0 for i in (key.start, key.stop))
+        return self._count() if open_ended or negative else self._limit
+
+    def _rows(self, start: int, stop: int) -> list[CallSchema]:
+        stop = min(stop, self._limit)
+        if start >= stop:
+            return []
+        first_page = start // self._page_size
+        last_page = (stop - 1) // self._page_size
+        page_indexes = range(first_page, last_page + 1)
+        if self._prefetch > 0 and len(page_indexes) > 1:
+            with ThreadPoolExecutor(max_workers=self._prefetch) as executor:
+                pages = list(executor.map(self._get_page, page_indexes))
+        else:
+            pages = [self._get_page(page_index) for page_index in page_indexes]
+        rows = [row for page in pages for row in page]
+        offset = first_page * self._page_size
+        return rows[start - offset : stop - offset]
+
+    def _get_page(self, page_index: int) -> list[CallSchema]:
+        if self._page_cache is None:
+            return self._fetch_page(page_index)
+        # Calls are built from the rows with from_json, which pops "_type" as it
+        # decodes, so cached pages are handed out as copies.
+        cached = self._page_cache.get_many([page_index])
+        if page_index in cached:
+            return copy.deepcopy(cached[page_index])
+        page_data = self._fetch_page(page_index)
+        self._page_cache.put_many({page_index: page_data})
+        return copy.deepcopy(page_data)
+
+    def _fetch_page(self, page_index: int) -> list[CallSchema]:
+        offset = page_index * self._page_size
+        response = self.server.calls_query(
+            CallsQueryReq(
+                project_id=self.project_id,
+                filter=self.filter,
+                offset=offset,
+                columns=self._columns,
+                expand_columns=self._expand_columns,
+                limit=min(self._page_size, self._limit - offset),
+            )
+        )
+        return response.calls
+
+    def _fetch_keyset_page(
+        self, cursor: Optional[KeysetCursor], limit: int
+    ) -> list[CallSchema]:
+        columns = self._columns
+        if columns is not None:
+            columns = columns + [c for c in ("id", "started_at") if c not in columns]
+        conditions: list[dict[str, Any]] = []
+        if cursor is not None:
+            started_at, seen_ids = cursor
+            conditions.append(
+                {
+                    "$gte": [
+                        {"$getField": "started_at"},
+                        {
+                            "$literal": self._started_at_literal(
+                                started_at - KEYSET_MARGIN
+                            )
+                        },
+                    ]
+                }
+            )
+            if seen_ids:
+                conditions.append(
+                    {
+                        "$not": [
+                            {
+                                "$in": [
+                                    {"$getField": "id"},
+                                    [{"$literal": call_id} for call_id in seen_ids],
+                                ]
+                            }
+                        ]
+                    }
+                )
+        if self._before is not None:
+            conditions.append(
+                {
+                    "$not": [
+                        {
+                            "$gte": [
+                                {"$getField": "started_at"},
+                                {
+                                    "$literal": self._started_at_literal(
+                                        self._before + KEYSET_MARGIN
+                                    )
+                                },
+                            ]
+                        }
+                    ]
+                }
+            )
+        query = None
+        if conditions:
+            # Nested pairs, the SQLite server only reads two $and operands
+            expr = conditions[-1]
+            for condition in reversed(conditions[:-1]):
+                expr = {"$and": [condition, expr]}
+            query = Query.model_validate({"$expr": expr})
+        response = self.server.calls_query(
+            CallsQueryReq(
+                project_id=self.project_id,
+                filter=self.filter,
+                query=query,
+                sort_by=[
+                    SortBy(field="started_at", direction="asc"),
+                    SortBy(field="id", direction="asc"),
+                ],
+                columns=columns,
+                expand_columns=self._expand_columns,
+                limit=limit,
+            )
+        )
+        return response.calls
+
+    def _started_at_literal(self, started_at: datetime.datetime) -> float | str:
+        if started_at_is_text(self.server, self.project_id):
+            return started_at.isoformat()
+        return started_at.timestamp()
+
+    def _keyset_pages(self) -> Iterator[list[CallSchema]]:
+        executor = ThreadPoolExecutor(max_workers=1) if self._prefetch > 0 else None
+
+        def fetch(cursor: Optional[KeysetCursor], limit: int):
+            if executor is None:
+                return _Resolved(self._fetch_keyset_page(cursor, limit))
+            return executor.submit(self._fetch_keyset_page, cursor, limit)
+
+        cursor: Optional[KeysetCursor] = self._after
+        remaining = self._limit
+        request_limit = min(self._page_size, remaining)
+        pending = fetch(cursor, request_limit)
+        try:
+            while pending is not None:
+                raw_page = pending.result()
+                page_data = [c for c in raw_page if _after_cursor(c, cursor)]
+                if raw_page and not page_data:
+                    raise ValueError(
+                        "Trace server ignored the keyset cursor, use offset pagination"
+                    )
+                cursor = advance_keyset_cursor(cursor, page_data)
+                # Rows are sorted by started_at, so once one reaches the upper
+                # bound the rest of the scan would too.
+                past_end = False
+                if self._before is not None:
+                    in_range = [
+                        c for c in page_data if as_utc(c.started_at) < self._before
+                    ]
+                    past_end = len(in_range) < len(page_data)
+                    page_data = in_range
+                remaining -= len(page_data)
+                pending = None
+                if len(raw_page) == request_limit and remaining > 0 and not past_end:
+                    # The cursor is known as soon as the raw page arrives, so
+                    # the next request overlaps with deserializing this one.
+                    request_limit = min(self._page_size, remaining)
+                    pending = fetch(cursor, request_limit)
+                yield page_data
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _stream_pages(self) -> Iterator[list[CallSchema]]:
+        calls_stream = self.server.calls_query_stream(
+            CallsQueryReq(
+                project_id=self.project_id,
+                filter=self.filter,
+                columns=self._columns,
+                expand_columns=self._expand_columns,
+                limit=self._limit,
+            )
+        )
+        try:
+            while page_data := list(itertools.islice(calls_stream, self._page_size)):
+                yield page_data
+        finally:
+            close = getattr(calls_stream, "close", None)
+            if close is not None:
+                close()
+
+    def _pages(self) -> Iterator[list[CallSchema]]:
+        if self._stream:
+            yield from self._stream_pages()
+            return
+        if self._pagination == "keyset":
+            yield from self._keyset_pages()
+            return
+
+        num_pages = math.ceil(self._limit / self._page_size)
+        if self._prefetch <= 0:
+            for page_index in range(num_pages):
+                page_data = self._get_page(page_index)
+                yield page_data
+                if len(page_data) < self._page_size:
+                    return
+            return
+
+        # Pages are addressed by offset, so future pages don't depend on the
+        # current one and can be requested before it has been consumed.
+        last_page_seen = threading.Event()
+
+        def fetch(page_index: int) -> list[CallSchema]:
+            page_data = self._get_page(page_index)
+            if len(page_data) < self._page_size:
+                last_page_seen.set()
+            return page_data
+
+        with ThreadPoolExecutor(max_workers=self._prefetch) as executor:
+            in_flight: deque[Future[list[CallSchema]]] = deque()
+            next_page = 0
+            try:
+                while True:
+                    # Nothing is submitted past a short page, it's the last one
+                    while (
+                        next_page < num_pages
+                        and len(in_flight) < self._prefetch
+                        and not last_page_seen.is_set()
+                    ):
+                        in_flight.append(executor.submit(fetch, next_page))
+                        next_page += 1
+                    if not in_flight:
+                        return
+                    page_data = in_flight.popleft().result()
+                    yield page_data
+                    if len(page_data) < self._page_size:
+                        return
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def server_calls(self) -> Iterator[CallSchema]:
+        """Iterate over the raw server rows, without building Call objects."""
+        total_calls = 0
+        for page_data in self._pages():
+            total_calls += len(page_data)
+            if self._callback:
+                self._callback(total_calls)
+            yield from page_data
 
     def __iter__(self) -> Iterator[Call]:
-        page_index = 0
-        page_size = 200
         entity, project = self.project_id.split("/")
         total_calls = 0
-        while True:
-            response = self.server.calls_query(
-                CallsQueryReq(
-                    project_id=self.project_id,
-                    filter=self.filter,
-                    offset=page_index * page_size,
-                    columns=self._columns,
-                    limit=page_size,
-                )
-            )
-            page_data = response.calls
+        for page_data in self._pages():
             total_calls += len(page_data)
             if self._callback:
                 self._callback(total_calls)
             for call in page_data:
                 # TODO: if we want to be able to refer to call outputs
                 # we need to yield a ref-tracking call here.
-                yield make_client_call(entity, project, call, self.server)
+                yield self._make_call(entity, project, call, self.server)
                 # yield make_trace_obj(call, ValRef(call.id), self.server, None)
-            if len(page_data) < page_size:
-                break
-            page_index += 1
-            if page_index * page_size + len(page_data) >= self._limit:
-                break
+
+    async def __aiter__(self) -> AsyncIterator[Call]:
+        # The trace server client is blocking, so each page is fetched on a
+        # worker thread and the event loop stays free while it's in flight.
+        entity, project = self.project_id.split("/")
+        total_calls = 0
+        pages = self._pages()
+        pending: Optional[asyncio.Future] = None
+
+        def close_pages(future: asyncio.Future) -> None:
+            if not future.cancelled():
+                future.exception()  # Already raised to the iterator, if any
+            pages.close()
+
+        try:
+            while True:
+                pending = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+                # Shielded, so cancelling the iterator doesn't abandon the
+                # worker thread while it's still inside the generator
+                page_data = await asyncio.shield(pending)
+                pending = None
+                if page_data is None:
+                    break
+                total_calls += len(page_data)
+                if self._callback:
+                    self._callback(total_calls)
+                for call in page_data:
+                    yield self._make_call(entity, project, call, self.server)
+        finally:
+            if pending is not None and not pending.done():
+                # Closing a generator that's executing raises, so close it
+                # once the pending page is done.
+                pending.add_done_callback(close_pages)
+            else:
+                pages.close()
 
     def column(self, col_name: str) -> "CallsIter":
-        return CallsIter(self.server, self.project_id, CallsFilter(), [col_name])
+        return CallsIter(
+            self.server,
+            self.project_id,
+            self.filter,
+            [col_name],
+            limit=self._limit,
+            callback=self._callback,
+            prefetch=self._prefetch,
+            page_size=self._page_size,
+            pagination=self._pagination,
+            stream=self._stream,
+        )
+
+    def values(self, path: str) -> Iterator[Any]:
+        """Yield one dotted field of each raw row, None where it's missing."""
+        for call in self.server_calls():
+            yield call_field(call, path)
+
+
+def call_field(call: CallSchema, path: str) -> Any:
+    """A dotted field of a raw call row, e.g. "summary.weave.latency_ms"."""
+    root, *keys = path.split(".")
+    val = getattr(call, root, None)
+    for key in keys:
+        val = val.get(key) if isinstance(val, dict) else None
+    return val
+
+
+def as_utc(dt: datetime.datetime) -> datetime.datetime:
+    """dt in UTC. Naive datetimes are taken to be UTC already, as the trace
+    server stores them."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.astimezone(datetime.timezone.utc)
+
+
+# Whether a server compares started_at as ISO text (the SQLite server) rather
+# than as a timestamp, by server object
+_text_started_at: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+# Concurrent scans, e.g. the windows of a sharded fetch, probe once
+_text_started_at_lock = threading.Lock()
+
+
+def started_at_is_text(server: TraceServerInterface, project_id: str) -> bool:
+    """Whether started_at $literals have to be ISO strings for this server."""
+    with _text_started_at_lock:
+        try:
+            return _text_started_at[server]
+        except (KeyError, TypeError):
+            pass
+        is_text = _probe_started_at_is_text(server, project_id)
+        if is_text is None:
+            # An empty project can't tell, and either form matches nothing
+            return False
+        try:
+            _text_started_at[server] = is_text
+        except TypeError:
+            pass
+        return is_text
+
+
+def _probe_started_at_is_text(
+    server: TraceServerInterface, project_id: str
+) -> Optional[bool]:
+    # A timestamp far in the future matches no row on a server that compares
+    # timestamps, but every row on one that compares text with numbers.
+    def first_row(query: Optional[Query]) -> bool:
+        response = server.calls_query(
+            CallsQueryReq(
+                project_id=project_id,
+                query=query,
+                columns=["id", "started_at"],
+                limit=1,
+            )
+        )
+        return bool(response.calls)
+
+    far_future = Query.model_validate(
+        {"$expr": {"$gte": [{"$getField": "started_at"}, {"$literal": 1e12}]}}
+    )
+    if first_row(far_future):
+        return True
+    if first_row(None):
+        return False
+    return None
+
+
+def _after_cursor(call: CallSchema, cursor: Optional[KeysetCursor]) -> bool:
+    if cursor is None:
+        return True
+    started_at, seen_ids = cursor
+    call_started_at = as_utc(call.started_at)
+    if call_started_at == started_at:
+        return call.id not in seen_ids
+    return call_started_at > started_at
+
+
+def advance_keyset_cursor(
+    cursor: Optional[KeysetCursor], page_data: list[CallSchema]
+) -> Optional[KeysetCursor]:
+    # The cursor is the latest started_at seen, plus the ids seen within
+    # KEYSET_MARGIN of it. The server bound is widened by the margin, so
+    # those ids are excluded by id rather than by offset.
+    if not page_data:
+        return cursor
+    if cursor is not None:
+        started_at, seen_ids = as_utc(cursor[0]), set(cursor[1])
+    else:
+        started_at, seen_ids = None, set()
+    latest = max(as_utc(call.started_at) for call in page_data)
+    if started_at is None or latest - KEYSET_MARGIN > started_at:
+        # Nothing seen before this page is within the margin any more
+        seen_ids = set()
+    if started_at is None or latest > started_at:
+        started_at = latest
+    for call in page_data:
+        if as_utc(call.started_at) >= started_at - KEYSET_MARGIN:
+            seen_ids.add(call.id)
+    return started_at, seen_ids
+
+
+class _Resolved:
+    # Minimal stand-in for a completed Future when prefetching is disabled.
+    def __init__(self, value: list[CallSchema]) -> None:
+        self._value = value
+
+    def result(self) -> list[CallSchema]:
+        return self._value
+
+
+def weave_client_calls_filter(
+    self: WeaveClient,
+    op_names: list[str] | str | None = None,
+    input_refs: list[str] | str | None = None,
+    trace_roots_only: bool | None = None,
+) -> CallsFilter:
+    trace_server_filt = CallsFilter()
+    trace_server_filt.trace_roots_only = trace_roots_only
+    if op_names:
+        if isinstance(op_names, str):
+            op_names = [op_names]
+        op_ref_uris = []
+        for op_name in op_names:
+            if op_name.startswith("weave:///"):
+                op_ref_uris.append(op_name)
+            else:
+                if ":" not in op_name:
+                    op_name = op_name + ":*"
+                op_ref_uris.append(f"weave:///{self._project_id()}/op/{op_name}")
+        trace_server_filt.op_names = op_ref_uris
+    if input_refs:
+        if isinstance(input_refs, str):
+            input_refs = [input_refs]
+        trace_server_filt.input_refs = input_refs
+    return trace_server_filt
 
 
 def weave_client_calls(
@@ -166,33 +752,142 @@ def weave_client_calls(
     trace_roots_only: bool | None = None,
     limit: int | None = None,
     callback: Optional[Callable[[int], None]] = None,
+    prefetch: int = 0,
+    pagination: Pagination = "offset",
+    stream: bool = False,
+    columns: List[str] | None = None,
+    expand_columns: List[str] | None = None,
+    lazy: bool = False,
+    after: Optional[KeysetCursor] = None,
+    page_cache: int = 0,
 ) -> CallsIter:
     if trace_server_filt is None:
-        trace_server_filt = CallsFilter()
-        trace_server_filt.trace_roots_only = trace_roots_only
-        if op_names:
-            if isinstance(op_names, str):
-                op_names = [op_names]
-            op_ref_uris = []
-            for op_name in op_names:
-                if op_name.startswith("weave:///"):
-                    op_ref_uris.append(op_name)
-                else:
-                    if ":" not in op_name:
-                        op_name = op_name + ":*"
-                    op_ref_uris.append(f"weave:///{self._project_id()}/op/{op_name}")
-            trace_server_filt.op_names = op_ref_uris
-        if input_refs:
-            if isinstance(input_refs, str):
-                input_refs = [input_refs]
-            trace_server_filt.input_refs = input_refs
+        trace_server_filt = weave_client_calls_filter(
+            self, op_names, input_refs, trace_roots_only
+        )
     return CallsIter(
         self.server,
         self._project_id(),
         trace_server_filt,
+        columns=columns,
         limit=limit,
         callback=callback,
+        prefetch=prefetch,
+        pagination=pagination,
+        stream=stream,
+        expand_columns=expand_columns,
+        lazy=lazy,
+        after=after,
+        page_cache=page_cache,
+    )
+
+
+def _started_at_bound(
+    self: WeaveClient, filter: CallsFilter, direction: str, offset: int = 0
+) -> Optional[datetime.datetime]:
+    response = self.server.calls_query(
+        CallsQueryReq(
+            project_id=self._project_id(),
+            filter=filter,
+            sort_by=[
+                SortBy(field="started_at", direction=direction),
+                SortBy(field="id", direction=direction),
+            ],
+            columns=["id", "started_at"],
+            offset=offset or None,
+            limit=1,
+        )
+    )
+    return as_utc(response.calls[0].started_at) if response.calls else None
+
+
+def weave_client_calls_sharded(
+    self: WeaveClient,
+    filter: CallsFilter,
+    shards: int,
+    limit: int | None = None,
+    callback: Optional[Callable[[int], None]] = None,
+    columns: List[str] | None = None,
+    expand_columns: List[str] | None = None,
+    lazy: bool = False,
+    started_after: Optional[datetime.datetime] = None,
+    started_before: Optional[datetime.datetime] = None,
+) -> Iterator[Call]:
+    """Fetch calls from N started_at windows in parallel, in time order.
+
+    The range defaults to the first and last matching call, and is cut at
+    the limit-th call so the windows together hold about limit calls. Each
+    window is a keyset scan over [start, end), so calls on a window edge
+    belong to exactly one window. The callback is called from the calling
+    thread as windows complete.
+    """
+    limit = limit or DEFAULT_LIMIT
+    if started_after is None:
+        started_after = _started_at_bound(self, filter, "asc")
+        # The same calls an unsharded read returns: the first limit of them.
+        # Only ties at the cut are fetched past the limit.
+        cut = _started_at_bound(self, filter, "asc", offset=limit - 1)
+        if cut is not None:
+            cut += datetime.timedelta(microseconds=1)
+            if started_before is None or cut < started_before:
+                started_before = cut
+    if started_before is None:
+        last = _started_at_bound(self, filter, "desc")
+        if last is not None:
+            started_before = last + datetime.timedelta(microseconds=1)
+    if started_after is None or started_before is None:
+        return
+    started_after, started_before = as_utc(started_after), as_utc(started_before)
+    step = (started_before - started_after) / shards
+    edges = [started_after + step * i for i in range(shards)] + [started_before]
+
+    def fetch(start: datetime.datetime, end: datetime.datetime) -> list[CallSchema]:
+        return list(
+            CallsIter(
+                self.server,
+                self._project_id(),
+                filter,
+                columns=columns,
+                limit=limit,
+                pagination="keyset",
+                expand_columns=expand_columns,
+                after=(start, set()),
+                before=end,
+            ).server_calls()
+        )
+
+    entity, project = self._project_id().split("/")
+    make_call = make_lazy_client_call if lazy else make_client_call
+    seen_ids: set[str] = set()
+    total = 0
+    with ThreadPoolExecutor(max_workers=min(shards, SHARD_CONCURRENCY)) as executor:
+        futures = [
+            executor.submit(fetch, start, end)
+            for start, end in zip(edges, edges[1:])
+            if start < end
+        ]
+        try:
+            for future in futures:
+                for call in future.result():
+                    if call.id in seen_ids:
+                        continue
+                    seen_ids.add(call.id)
+                    yield make_call(entity, project, call, self.server)
+                    total += 1
+                    if total >= limit:
+                        return
+                if callback:
+                    callback(total)
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def weave_client_calls_count(self: WeaveClient, filter: CallsFilter) -> int:
+    response = self.server.calls_query_stats(
+        CallsQueryStatsReq(project_id=self._project_id(), filter=filter)
     )
+    return response.count
 
 
 def weave_client_ops(
@@ -267,17 +962,103 @@ def weave_client_objs(
     return response.objs
 
 
-def weave_client_get_batch(self, refs: Sequence[str]) -> Sequence[Any]:
-    # Create a dictionary to store unique refs and their results
+class LRUCache:
+    """A thread safe, size bounded mapping that evicts the least recently used."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+        return found
+
+    def put_many(self, items: dict[Hashable, Any]) -> None:
+        with self._lock:
+            for key, val in items.items():
+                self._data[key] = val
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Raw server values of digest-pinned refs, shared by every client in the process
+ref_cache = LRUCache(REF_CACHE_SIZE)
+
+
+def is_pinned_ref(uri: str) -> bool:
+    """Whether a ref points at a content addressed version that can't change."""
+    try:
+        ref = parse_uri(uri)
+    except ValueError:
+        return False
+    if not isinstance(ref, (ObjectRef, TableRef)):
+        return False
+    return DIGEST_RE.fullmatch(ref.digest) is not None
+
+
+def weave_client_read_refs(self, refs: Iterable[str]) -> dict[str, Any]:
+    """Read the raw server values of refs, from the ref caches where possible.
+
+    Values are shared with the in-memory cache, so copy them before decoding
+    or otherwise changing them.
+    """
     unique_refs = list(set(refs))
-    read_res = self.server.refs_read_batch(
-        RefsReadBatchReq(refs=[uri for uri in unique_refs])
-    )
+    vals = ref_cache.get_many(unique_refs)
+    missing = [ref for ref in unique_refs if ref not in vals]
+
+    store = get_ref_store()
+    if store is not None and missing:
+        stored = store.get_many(ref for ref in missing if is_pinned_ref(ref))
+        ref_cache.put_many(stored)
+        vals.update(stored)
+        missing = [ref for ref in missing if ref not in stored]
+
+    # Only read refs we don't already have, in chunks that run in parallel
+    chunks = [
+        missing[i : i + REFS_BATCH_SIZE]
+        for i in range(0, len(missing), REFS_BATCH_SIZE)
+    ]
+
+    def read(chunk: list[str]) -> list[Any]:
+        return self.server.refs_read_batch(RefsReadBatchReq(refs=chunk)).vals
+
+    if len(chunks) > 1:
+        max_workers = min(REFS_BATCH_CONCURRENCY, len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chunk_vals = list(executor.map(read, chunks))
+    else:
+        chunk_vals = [read(chunk) for chunk in chunks]
+    fetched = dict(zip(missing, itertools.chain.from_iterable(chunk_vals)))
+    pinned = {ref: v for ref, v in fetched.items() if is_pinned_ref(ref)}
+    ref_cache.put_many(pinned)
+    if store is not None:
+        store.put_many(pinned)
+    vals.update(fetched)
+    return vals
+
+
+def weave_client_get_batch(self, refs: Sequence[str]) -> Sequence[Any]:
+    vals = weave_client_read_refs(self, refs)
 
-    # Create a mapping from ref to result
+    # Create a mapping from ref to result. from_json consumes the dict it
+    # decodes, so cached values are decoded from a copy.
     ref_to_result = {
-        unique_refs[i]: from_json(val, self._project_id(), self.server)
-        for i, val in enumerate(read_res.vals)
+        ref: from_json(copy.deepcopy(val), self._project_id(), self.server)
+        for ref, val in vals.items()
     }
 
     # Return results in the original order of refs
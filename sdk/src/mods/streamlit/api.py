@@ -8,11 +8,13 @@ from weave.trace.weave_client import WeaveClient
 from weave.trace_server.trace_server_interface import CallsFilter
 from weave.wandb_interface import wandb_api
 
+from mods.api.call_store import default_call_store
+from mods.api.catalog import get_catalog
 from mods.api.query import ST_HASH_FUNCS, Calls, Obj, Op, get_objs
 from mods.api.query import get_calls as api_get_calls
 from mods.api.query import get_op_versions as api_get_op_versions
 from mods.api.query import get_ops as api_get_ops
-from mods.api.weave_api_next import weave_client_get_batch
+from mods.api.query import resolve_refs as api_resolve_refs
 
 default_entity: str | None = os.getenv("WANDB_ENTITY")
 weave_clients: Dict[str, WeaveClient] = {}
@@ -111,32 +113,13 @@ def to_ref(name: str, project_id: str | None = None, type: str = "op"):
     return f"weave:///{project_id}/{type}/{name}"
 
 
-def simple_val(v: Any) -> str | List[str] | Dict[str, Any]:
-    if isinstance(v, dict):
-        return {k: simple_val(v) for k, v in v.items()}
-    elif isinstance(v, list):
-        return [simple_val(v) for v in v]
-    elif hasattr(v, "uri"):
-        return v.uri()
-    # elif hasattr(v, "__dict__"):
-    #     return {k: simple_val(v) for k, v in v.__dict__.items()}
-    else:
-        return v
-
-
 def resolve_refs(refs: List[str], client: WeaveClient | None = None) -> pd.DataFrame:
     if client is None:
         client = current_client()
 
     @st.cache_data(hash_funcs=ST_HASH_FUNCS)
     def _cached_resolve_refs(client, refs):
-        # Resolve the refs and fetch the message.text field
-        # Note we do do this after grouping, so we don't over-fetch refs
-        ref_vals = weave_client_get_batch(client, refs)
-        ref_vals = simple_val(ref_vals)
-        ref_val_df = pd.json_normalize(ref_vals)
-        ref_val_df.index = refs
-        return ref_val_df
+        return api_resolve_refs(client, refs)
 
     return _cached_resolve_refs(client, refs)
 
@@ -147,6 +130,9 @@ def get_calls(
     calls_filter: CallsFilter | None = None,
     cached: bool = True,
     client: WeaveClient | None = None,
+    columns: List[str] | None = None,
+    expand_columns: List[str] | None = None,
+    incremental: bool = False,
 ) -> Calls:
     """Fetch operation calls from Weave with optional caching and progress tracking.
 
@@ -156,6 +142,12 @@ def get_calls(
         calls_filter: Optional CallsFilter to filter calls by
         cached: Whether to use cached results (defaults to True)
         client: WeaveClient instance
+        columns: Optional list of call columns to fetch, e.g. ["summary.weave.latency_ms"].
+            Other columns are fetched on demand with Calls.fetch_columns
+        expand_columns: Optional list of ref columns to expand server side
+        incremental: Keep calls in a local store that survives restarts and only
+            fetch calls newer than the last refresh, less a few minutes' overlap
+            for calls that arrive late, plus calls still running (defaults to False)
 
     Returns:
         Calls object containing the fetched operation calls
@@ -173,16 +165,68 @@ def get_calls(
 
         return _callback
 
+    if incremental:
+
+        def stored_get_calls(
+            client,
+            op_name,
+            input_refs,
+            calls_filter,
+            columns,
+            expand_columns,
+            _progress,
+        ):
+            return default_call_store().get_calls(
+                client,
+                op_name,
+                input_refs,
+                calls_filter,
+                callback=_progress,
+                columns=columns,
+                expand_columns=expand_columns,
+            )
+
+        if cached:
+            # The store persists across restarts, this only avoids a refresh
+            # round-trip on every rerun.
+            stored_get_calls = st.cache_data(hash_funcs=ST_HASH_FUNCS, ttl=60)(
+                stored_get_calls
+            )
+        with st.status("Fetching calls...", expanded=True) as status:
+            return stored_get_calls(
+                client,
+                op_name,
+                input_refs,
+                calls_filter,
+                columns,
+                expand_columns,
+                progress(status),
+            )
+
     if not cached:
         with st.status("Fetching calls...", expanded=True) as status:
             return api_get_calls(
-                client, op_name, input_refs, calls_filter, callback=progress(status)
+                client,
+                op_name,
+                input_refs,
+                calls_filter,
+                callback=progress(status),
+                columns=columns,
+                expand_columns=expand_columns,
             )
 
     @st.cache_data(persist="disk", hash_funcs=ST_HASH_FUNCS, ttl=3600)
-    def cached_get_calls(client, op_name, input_refs, calls_filter, _progress):
+    def cached_get_calls(
+        client, op_name, input_refs, calls_filter, columns, expand_columns, _progress
+    ):
         return api_get_calls(
-            client, op_name, input_refs, calls_filter, callback=_progress
+            client,
+            op_name,
+            input_refs,
+            calls_filter,
+            callback=_progress,
+            columns=columns,
+            expand_columns=expand_columns,
         )
 
     status_container = st.empty()
@@ -190,7 +234,13 @@ def get_calls(
         with status_container.status("Fetching calls...", expanded=True) as status:
             if not isinstance(op_name, list):
                 calls = cached_get_calls(
-                    client, op_name, input_refs, calls_filter, progress(status)
+                    client,
+                    op_name,
+                    input_refs,
+                    calls_filter,
+                    columns,
+                    expand_columns,
+                    progress(status),
                 )
                 if status is not None:
                     status.update(state="complete")
@@ -200,7 +250,13 @@ def get_calls(
             offset = 0
             for op in op_name:
                 result = cached_get_calls(
-                    client, op, input_refs, calls_filter, progress(status, offset)
+                    client,
+                    op,
+                    input_refs,
+                    calls_filter,
+                    columns,
+                    expand_columns,
+                    progress(status, offset),
                 )
                 if result.df is not None and not result.df.empty:
                     result.df = result.df.dropna(subset=["id"])
@@ -218,7 +274,11 @@ def get_calls(
     finally:
         status_container.empty()
 
-    return Calls(df.set_index("id", drop=False) if not df.empty else df)
+    return Calls(
+        df.set_index("id", drop=False) if not df.empty else df,
+        client._project_id(),
+        columns,
+    )
 
 
 def get_objects(
@@ -233,7 +293,7 @@ def get_objects(
         client: WeaveClient instance
         object_type: Type of objects to fetch
         latest_only: Whether to fetch only the latest version of each object
-        cached: Whether to use cached results (defaults to True)
+        cached: Whether to serve from the project Catalog (defaults to True)
 
     Returns:
         List of Obj instances
@@ -242,12 +302,7 @@ def get_objects(
         client = current_client()
     if not cached:
         return get_objs(client, object_type, latest_only)
-
-    @st.cache_data(hash_funcs=ST_HASH_FUNCS)
-    def cached_get_objects(client, object_type, latest_only):
-        return get_objs(client, object_type, latest_only)
-
-    return cached_get_objects(client, object_type, latest_only)
+    return get_catalog(client).get_objs(object_type, latest_only)
 
 
 def get_ops(
@@ -269,12 +324,7 @@ def get_ops(
         client = current_client()
     if not cached:
         return api_get_ops(client, latest_only=latest_only)
-
-    @st.cache_data(hash_funcs=ST_HASH_FUNCS)
-    def cached_get_ops(client: WeaveClient, latest_only: bool):
-        return api_get_ops(client, latest_only=latest_only)
-
-    return cached_get_ops(client, latest_only)
+    return get_catalog(client).get_ops(latest_only)
 
 
 def get_op_versions(
@@ -298,10 +348,12 @@ def get_op_versions(
         client = current_client()
     if not cached:
         return api_get_op_versions(client, op, include_call_counts)
+    if not include_call_counts:
+        return get_catalog(client).get_op_versions(op)
 
     @st.cache_data(hash_funcs=ST_HASH_FUNCS)
     def cached_get_op_versions(client: WeaveClient, op: Op, include_call_counts: bool):
-        return api_get_op_versions(client, op, include_call_counts)
+        return get_catalog(client).get_op_versions(op, include_call_counts)
 
     return cached_get_op_versions(client, op, include_call_counts)
 
@@ -0,0 +1,59 @@
+import datetime
+import unittest
+
+from weave.trace.object_record import ObjectRecord
+from weave.trace_server.trace_server_interface import (
+    CallSchema,
+    CallsFilter,
+    CallsQueryRes,
+)
+
+from mods.api.weave_api_next import CallsIter
+
+PROJECT = "entity/project"
+
+
+def _call(i: int) -> CallSchema:
+    return CallSchema(
+        id=f"call-{i}",
+        project_id=PROJECT,
+        op_name=f"weave:///{PROJECT}/op/predict:abc",
+        trace_id="trace",
+        started_at=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+        attributes={},
+        inputs={
+            "obj": {
+                "_type": "Thing",
+                "_class_name": "Thing",
+                "_bases": ["Object", "BaseModel"],
+                "value": i,
+            }
+        },
+    )
+
+
+class FakeServer:
+    def __init__(self, num_calls: int) -> None:
+        self.calls = [_call(i) for i in range(num_calls)]
+        self.queries = 0
+
+    def calls_query(self, req) -> CallsQueryRes:
+        self.queries += 1
+        offset = req.offset or 0
+        return CallsQueryRes(calls=self.calls[offset : offset + req.limit])
+
+
+class CallsIterPageCacheTest(unittest.TestCase):
+    def test_repeat_reads_decode_objects(self) -> None:
+        server = FakeServer(5)
+        it = CallsIter(server, PROJECT, CallsFilter(), page_size=2, page_cache=4)
+        first = it[0].inputs["obj"]
+        second = it[0].inputs["obj"]
+        self.assertIsInstance(first, ObjectRecord)
+        self.assertIsInstance(second, ObjectRecord)
+        self.assertEqual(second.value, 0)
+        self.assertEqual(server.queries, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()